@@ -7,32 +7,176 @@ class FiniteAutomaton:
         self.QF = QF  # Final states
     
     def does_string_belong_to_language(self, input_string):
-        current_states = {self.Q0}
-        print(f"\nChecking string: \"{input_string}\"")
+        return self.accepts(input_string, tracer=PrintTracer())
+    
+    def accepts(self, input_string, tracer=None):
+        # Quiet matcher: the two state buffers are allocated once per call
+        # (so concurrent calls never share them) and swapped between steps;
+        # pass a tracer to get the step-by-step trace
+        current_states, next_states = {self.Q0}, set()
+        delta = self.Delta
+        sigma = self.Sigma
+        
+        if tracer:
+            tracer.start(input_string)
         
         for letter in input_string:
-            print(f"Processing letter: \"{letter}\"")
-            if letter not in self.Sigma:
-                print(f"Invalid character \"{letter}\".")
+            if tracer:
+                tracer.letter(letter)
+            if letter not in sigma:
+                if tracer:
+                    tracer.invalid_letter(letter)
                 return False
             
-            next_states = set()
+            next_states.clear()
             for state in current_states:
-                if state in self.Delta and letter in self.Delta[state]:
-                    next_states.update(self.Delta[state][letter])
+                transitions = delta.get(state)
+                if transitions and letter in transitions:
+                    next_states.update(transitions[letter])
             
+            # Dead state: no continuation can be accepted
             if not next_states:
-                print(f"No valid transitions found. \"{input_string}\" is INVALID.")
+                if tracer:
+                    tracer.dead(input_string)
                 return False
             
-            current_states = next_states
-            print(f"Possible next states: {', '.join(current_states)}")
+            current_states, next_states = next_states, current_states
+            if tracer:
+                tracer.step(frozenset(current_states))
         
-        is_valid = any(state in self.QF for state in current_states)
-        print(f"Final states: {', '.join(current_states)}")
-        print(f"Result: \"{input_string}\" is {'VALID ✓' if is_valid else 'INVALID ✗'}")
+        is_valid = not current_states.isdisjoint(self.QF)
+        if tracer:
+            tracer.finish(input_string, frozenset(current_states), is_valid)
         return is_valid
     
+    def match_many(self, strings, workers=1, chunk_size=10000):
+        # Quiet batch membership: returns an array('B') of 0/1 results in input
+        # order. With several workers the automaton is pickled once per worker
+        # and the input is matched chunk by chunk in a process pool.
+        from array import array
+        from multiprocessing import Pool
+        
+        results = array('B')
+        chunks = _chunks(strings, chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                results.frombytes(_match_chunk_with(self, chunk))
+            return results
+        
+        with Pool(workers, initializer=_init_match_worker, initargs=(self,)) as pool:
+            for chunk_results in pool.imap(_match_chunk, chunks):
+                results.frombytes(chunk_results)
+        return results
+    
+    def stream(self):
+        return StreamMatcher(self)
+    
+    def count_words(self, n):
+        # Number of distinct accepted words of length exactly n
+        start, transitions, finals = self._subset_automaton()
+        return self._counting_table(transitions, finals, n)[n][start]
+    
+    def uniform_words(self, n, count, rng=None):
+        import random
+        
+        # Sample count accepted words of length exactly n, each one uniformly
+        # among all such words. counts[k][q] is the number of words of length
+        # k accepted from state q of the determinized automaton, so every
+        # letter is drawn with probability proportional to the completions it
+        # leaves, with no rejection and no dead ends.
+        rng = rng or random
+        start, transitions, finals = self._subset_automaton()
+        counts = self._counting_table(transitions, finals, n)
+        if counts[n][start] == 0:
+            raise ValueError(f"The language has no words of length {n}")
+        
+        for _ in range(count):
+            state = start
+            letters = []
+            for remaining in range(n, 0, -1):
+                pick = rng.randrange(counts[remaining][state])
+                for letter, next_state in transitions[state].items():
+                    pick -= counts[remaining - 1][next_state]
+                    if pick < 0:
+                        break
+                letters.append(letter)
+                state = next_state
+            yield ''.join(letters)
+    
+    def enumerate_words(self, max_len):
+        # Yield every accepted word of length at most max_len, shortest first
+        # and alphabetically within a length. viable[r][q] says whether some
+        # word of exactly r letters leads from q to acceptance, so the walk
+        # for each length never enters a prefix that cannot be completed and
+        # only keeps the current path in memory.
+        start, transitions, finals = self._subset_automaton()
+        viable = [finals]
+        for _ in range(max_len):
+            previous = viable[-1]
+            viable.append([
+                any(previous[next_state] for next_state in moves.values())
+                for moves in transitions
+            ])
+        
+        for length in range(max_len + 1):
+            if not viable[length][start]:
+                continue
+            
+            word = []
+            path = [iter(transitions[start].items())]
+            while path:
+                if len(word) == length:
+                    yield ''.join(word)
+                    path.pop()
+                    if word:
+                        word.pop()
+                    continue
+                
+                remaining = viable[length - len(word) - 1]
+                for letter, next_state in path[-1]:
+                    if remaining[next_state]:
+                        word.append(letter)
+                        path.append(iter(transitions[next_state].items()))
+                        break
+                else:
+                    path.pop()
+                    if word:
+                        word.pop()
+    
+    def _subset_automaton(self):
+        # Determinize the reachable part of the automaton: states are numbered
+        # subsets, transitions[i] maps a letter to the next subset's number
+        start_set = frozenset([self.Q0])
+        ids = {start_set: 0}
+        subsets = [start_set]
+        transitions = []
+        for subset in subsets:
+            moves = {}
+            for letter in sorted(self.Sigma):
+                targets = set()
+                for state in subset:
+                    targets.update(self.Delta.get(state, {}).get(letter, ()))
+                if not targets:
+                    continue
+                targets = frozenset(targets)
+                if targets not in ids:
+                    ids[targets] = len(subsets)
+                    subsets.append(targets)
+                moves[letter] = ids[targets]
+            transitions.append(moves)
+        finals = [not subset.isdisjoint(self.QF) for subset in subsets]
+        return 0, transitions, finals
+    
+    def _counting_table(self, transitions, finals, n):
+        counts = [[1 if final else 0 for final in finals]]
+        for _ in range(n):
+            previous = counts[-1]
+            counts.append([
+                sum(previous[next_state] for next_state in moves.values())
+                for moves in transitions
+            ])
+        return counts
+    
     def generate_valid_string(self, max_length=10):
         import random
         
@@ -70,6 +214,119 @@ class FiniteAutomaton:
                     print(f"State {state} --{symbol}--> State {next_state}")
 
 
+class StreamMatcher:
+    # Resumable matcher: feed() the input chunk by chunk and read result() at
+    # the end. The current state set is carried across chunks; bytes chunks
+    # are decoded as UTF-8 incrementally, so a character split between two
+    # chunks is handled.
+    def __init__(self, automaton, encoding="utf-8"):
+        import codecs
+        
+        self.automaton = automaton
+        self.current_states = {automaton.Q0}
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+    
+    def feed(self, chunk):
+        if not isinstance(chunk, str):
+            try:
+                chunk = self._decoder.decode(chunk)
+            except UnicodeDecodeError:
+                # Invalid input is never accepted
+                self.current_states = set()
+                return False
+        
+        delta = self.automaton.Delta
+        sigma = self.automaton.Sigma
+        current_states = self.current_states
+        for letter in chunk:
+            if not current_states:
+                break
+            if letter not in sigma:
+                current_states = set()
+                break
+            
+            next_states = set()
+            for state in current_states:
+                transitions = delta.get(state)
+                if transitions and letter in transitions:
+                    next_states.update(transitions[letter])
+            current_states = next_states
+        
+        self.current_states = current_states
+        # False once the input can no longer be accepted
+        return bool(current_states)
+    
+    def feed_file(self, file, chunk_size=1 << 16):
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk or not self.feed(chunk):
+                return bool(self.current_states)
+    
+    def result(self):
+        try:
+            if self._decoder.decode(b"", final=True):
+                return False
+        except UnicodeDecodeError:
+            # The input ended in the middle of a character
+            return False
+        return not self.current_states.isdisjoint(self.automaton.QF)
+    
+    def reset(self):
+        self.current_states = {self.automaton.Q0}
+        self._decoder.reset()
+
+
+# Automaton installed in each pool worker by _init_match_worker()
+_worker_automaton = None
+
+
+def _init_match_worker(automaton):
+    global _worker_automaton
+    _worker_automaton = automaton
+
+
+def _match_chunk(chunk):
+    return _match_chunk_with(_worker_automaton, chunk)
+
+
+def _match_chunk_with(automaton, chunk):
+    accepts = automaton.accepts
+    return bytes(accepts(string) for string in chunk)
+
+
+def _chunks(iterable, size):
+    from itertools import islice
+    
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class PrintTracer:
+    # Prints the step-by-step trace of FiniteAutomaton.accepts()
+    def start(self, input_string):
+        print(f"\nChecking string: \"{input_string}\"")
+    
+    def letter(self, letter):
+        print(f"Processing letter: \"{letter}\"")
+    
+    def invalid_letter(self, letter):
+        print(f"Invalid character \"{letter}\".")
+    
+    def dead(self, input_string):
+        print(f"No valid transitions found. \"{input_string}\" is INVALID.")
+    
+    def step(self, current_states):
+        print(f"Possible next states: {', '.join(current_states)}")
+    
+    def finish(self, input_string, current_states, is_valid):
+        print(f"Final states: {', '.join(current_states)}")
+        print(f"Result: \"{input_string}\" is {'VALID ✓' if is_valid else 'INVALID ✗'}")
+
+
 class Grammar:
     def __init__(self, vN, vT, p, s):
         self.VN = vN  # Non-terminals
@@ -78,29 +335,65 @@ class Grammar:
         self.S = s    # Start symbol
     
     def create_word(self):
+        print("\nGenerating word:", self.S)
+        return self.derive_word(trace=lambda sentential_form: print(" =>", sentential_form))
+    
+    def derive_word(self, rng=None, trace=None, max_length=None):
         import random
         
-        word_in_progress = self.S
-        print("\nGenerating word:", word_in_progress)
+        # Leftmost derivation: the sentential form is the emitted terminals
+        # followed by a stack of pending symbols (top = leftmost), so every
+        # rewrite only touches the top of the stack instead of rescanning
+        # and re-slicing the whole word. Returns None once the word grows
+        # past max_length.
+        rng = rng or random
+        output = []
+        stack = [self.S]
         
-        while True:
-            found_non_terminal = False
-            for i, current_char in enumerate(word_in_progress):
-                if current_char in self.VN:
-                    found_non_terminal = True
-                    rules = self.P.get(current_char, [])
-                    if not rules:
-                        continue
-                    
-                    used_replacement = random.choice(rules)
-                    word_in_progress = word_in_progress[:i] + used_replacement + word_in_progress[i+1:]
-                    print(" =>", word_in_progress)
-                    break
+        while stack:
+            symbol = stack.pop()
+            rules = self.P.get(symbol) if symbol in self.VN else None
+            if not rules:
+                output.append(symbol)
+                if max_length is not None and len(output) > max_length:
+                    return None
+                continue
             
-            if not found_non_terminal:
-                break
+            stack.extend(reversed(rng.choice(rules)))
+            if trace:
+                trace(''.join(output) + ''.join(reversed(stack)))
+        
+        return ''.join(output)
+    
+    def stream_words(self, sink, count, rng=None):
+        # Write count generated words to a file-like sink, one per line
+        for _ in range(count):
+            sink.write(self.derive_word(rng))
+            sink.write("\n")
+    
+    def generate(self, n, seed=0, max_length=None, workers=1, path=None, chunk_size=1000):
+        # Reproducible bulk generation. Word i draws from its own random
+        # stream seeded with (seed, i), so the words depend only on the seed,
+        # never on the number of workers or on chunk_size. Returns an
+        # iterator over the words, or writes them to path (one per line)
+        # and returns the number written.
+        tasks = [
+            (seed, start, min(chunk_size, n - start), max_length)
+            for start in range(0, n, chunk_size)
+        ]
+        words = _generate_chunks(self, tasks, workers)
+        if path is None:
+            return words
         
-        return word_in_progress
+        with open(path, "w") as file:
+            for word in words:
+                file.write(word)
+                file.write("\n")
+        return n
+    
+    def uniform_words(self, n, count, rng=None):
+        # Words of length exactly n drawn uniformly, see FiniteAutomaton.uniform_words()
+        return self.to_finite_automaton().uniform_words(n, count, rng)
     
     def to_finite_automaton(self):
         q_f = {"q_F"}
@@ -138,6 +431,50 @@ class Grammar:
         return output
 
 
+# Grammar installed in each pool worker by _init_generate_worker()
+_worker_grammar = None
+
+
+def _init_generate_worker(grammar):
+    global _worker_grammar
+    _worker_grammar = grammar
+
+
+def _generate_chunk_task(task):
+    return _generate_chunk(_worker_grammar, *task)
+
+
+def _generate_chunk(grammar, seed, first_index, count, max_length, max_attempts=1000):
+    import random
+    
+    rng = random.Random()
+    words = []
+    while len(words) < count:
+        # Every word has its own stream, seeded with (seed, word index)
+        rng.seed(f"{seed}:{first_index + len(words)}")
+        for _ in range(max_attempts):
+            word = grammar.derive_word(rng, max_length=max_length)
+            if word is not None:
+                break
+        else:
+            raise ValueError(f"No word of at most {max_length} symbols after {max_attempts} attempts")
+        words.append(word)
+    return words
+
+
+def _generate_chunks(grammar, tasks, workers):
+    from multiprocessing import Pool
+    
+    if workers == 1:
+        for task in tasks:
+            yield from _generate_chunk(grammar, *task)
+        return
+    
+    with Pool(workers, initializer=_init_generate_worker, initargs=(grammar,)) as pool:
+        for words in pool.imap(_generate_chunk_task, tasks):
+            yield from words
+
+
 def generate_random_string(vT):
     import random
     
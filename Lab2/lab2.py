@@ -1,3 +1,11 @@
+import mmap
+import os
+from array import array
+from collections import OrderedDict, deque
+from itertools import islice
+from multiprocessing import Pool
+
+
 class Grammar:
     def __init__(self, Vn, Vt, P, S):
         self.Vn = Vn  # Non-terminal symbols
@@ -55,28 +63,59 @@ class FiniteAutomaton:
         self.q0 = q0        # Initial state
         self.F = F          # Set of final states
     
+    @property
+    def delta(self):
+        return self._delta
+    
+    @delta.setter
+    def delta(self, delta):
+        """Replace the transition function and rebuild the adjacency index"""
+        # delta is copied into a dict that reports in-place writes, so
+        # fa.delta[(q, a)] = p keeps the index and compile() cache in sync
+        self._delta = _Transitions(self, delta)
+        self._compiled = None  # (key, CompiledDFA) cached by compile()
+        # Index: state -> symbol -> frozenset of target states
+        self._index = {}
+        for key in self._delta:
+            self._transition_changed(key)
+    
+    def _transition_changed(self, key):
+        """Update the adjacency index after delta[key] was set or deleted"""
+        state, symbol = key
+        self._compiled = None
+        symbols = self._index.setdefault(state, {})
+        if key in self._delta:
+            symbols[symbol] = frozenset(_as_list(self._delta[key]))
+        else:
+            symbols.pop(symbol, None)
+    
+    def add_transition(self, state, symbol, next_state):
+        """Add a transition to delta"""
+        current = self._delta.get((state, symbol))
+        if current is None:
+            self._delta[(state, symbol)] = next_state
+        elif next_state not in _as_list(current):
+            self._delta[(state, symbol)] = _as_list(current) + [next_state]
+    
+    def __setstate__(self, state):
+        # delta is pickled as a plain dict and wrapped again here
+        delta = state.pop('_delta')
+        self.__dict__.update(state)
+        self.delta = delta
+    
     def is_deterministic(self):
         """Check if the finite automaton is deterministic"""
-        for state in self.Q:
-            for symbol in self.Sigma:
-                # Get transitions for this state and symbol
-                transitions = self.get_transitions(state, symbol)
+        for transitions in self._index.values():
+            for next_states in transitions.values():
                 # If there are multiple transitions for the same state and symbol
-                # or no transition at all, the automaton is non-deterministic
-                if len(transitions) > 1:
+                # the automaton is non-deterministic
+                if len(next_states) > 1:
                     return False
         return True
     
     def get_transitions(self, state, symbol):
         """Get all states reachable from a given state using a given symbol"""
-        transitions = []
-        for (s, sym), next_states in self.delta.items():
-            if s == state and sym == symbol:
-                if isinstance(next_states, list):
-                    transitions.extend(next_states)
-                else:
-                    transitions.append(next_states)
-        return transitions
+        return list(self._index.get(state, {}).get(symbol, ()))
     
     def to_regular_grammar(self):
         """Convert finite automaton to regular grammar"""
@@ -115,59 +154,754 @@ class FiniteAutomaton:
         if self.is_deterministic():
             return self  # Already a DFA
         
-        dfa_states = []
-        dfa_transitions = {}
-        dfa_final_states = []
+        # Subsets of NFA states are encoded as int bitsets, numbered in
+        # discovery order and processed breadth-first from a deque
+        bits, rows, final_mask = self._subset_tables()
+        symbols = list(self.Sigma)
+        start = 1 << bits[self.q0]
+        state_ids = {start: 0}
+        unmarked_states = deque([start])
         
-        # Start with the initial state
-        unmarked_states = [{self.q0}]
-        dfa_states = [frozenset({self.q0})]
+        new_delta = {}
+        new_F = []
         
         while unmarked_states:
-            current_state_set = unmarked_states.pop(0)
-            current_state_frozen = frozenset(current_state_set)
+            current_mask = unmarked_states.popleft()
+            current_name = f"q{state_ids[current_mask]}"
             
-            for symbol in self.Sigma:
-                next_state_set = set()
-                for state in current_state_set:
-                    # Get all next states for this state and symbol
-                    next_states = self.get_transitions(state, symbol)
-                    next_state_set.update(next_states)
-                
-                if not next_state_set:
+            # Each subset is dequeued exactly once, so it is recorded as final at most once
+            if current_mask & final_mask:
+                new_F.append(current_name)
+            
+            for symbol in symbols:
+                next_mask = _step_mask(current_mask, rows[symbol])
+                if not next_mask:
                     continue
                 
-                next_state_frozen = frozenset(next_state_set)
+                # If this is a new state, give it the next id and queue it
+                if next_mask not in state_ids:
+                    state_ids[next_mask] = len(state_ids)
+                    unmarked_states.append(next_mask)
+                
+                new_delta[(current_name, symbol)] = f"q{state_ids[next_mask]}"
+        
+        new_Q = [f"q{i}" for i in range(len(state_ids))]
+        new_q0 = "q0"
+        
+        return FiniteAutomaton(new_Q, self.Sigma, new_delta, new_q0, new_F)
+    
+    def _subset_tables(self):
+        """
+        Number the states as bit positions for bitset subset construction.
+        
+        Returns the state -> bit mapping, a symbol -> per-bit successor mask
+        table and the bitmask of final states.
+        """
+        bits = {}
+        for state in [self.q0, *self.Q, *self._index]:
+            bits.setdefault(state, len(bits))
+        for transitions in self._index.values():
+            for next_states in transitions.values():
+                for next_state in next_states:
+                    bits.setdefault(next_state, len(bits))
+        
+        rows = {symbol: [0] * len(bits) for symbol in self.Sigma}
+        for state, transitions in self._index.items():
+            for symbol, next_states in transitions.items():
+                if symbol in rows:
+                    rows[symbol][bits[state]] = sum(1 << bits[next_state] for next_state in next_states)
+        
+        final_mask = 0
+        for state in self.F:
+            if state in bits:
+                final_mask |= 1 << bits[state]
+        return bits, rows, final_mask
+    
+    def minimize(self):
+        """Minimize the automaton with Hopcroft's partition refinement"""
+        symbols, table, finals = _completed_table(self.to_dfa())
+        block_of = _hopcroft_partition(table, finals, len(symbols))
+        return _quotient_automaton(symbols, table, finals, block_of)
+    
+    def _minimize_moore(self):
+        """Minimize the automaton with Moore's algorithm (reference for minimize())"""
+        symbols, table, finals = _completed_table(self.to_dfa())
+        block_of = _moore_partition(table, finals)
+        return _quotient_automaton(symbols, table, finals, block_of)
+    
+    def compile(self):
+        """
+        Compile the minimized automaton into a table-driven CompiledDFA.
+        
+        The result is cached until delta changes, in place or through the
+        setter or add_transition(). The cache is also keyed by Q, Sigma, q0
+        and F, so reassigning or editing them compiles again.
+        """
+        key = (frozenset(self.Q), frozenset(self.Sigma), self.q0, frozenset(self.F))
+        if self._compiled is None or self._compiled[0] != key:
+            self._compiled = (key, CompiledDFA(self.minimize()))
+        return self._compiled[1]
+    
+    def match_many(self, strings, workers=1, chunk_size=10000):
+        """Check many strings against the compiled automaton, see CompiledDFA.match_many()"""
+        return self.compile().match_many(strings, workers, chunk_size)
+    
+    def enumerate_words(self, max_len):
+        """Yield the accepted words up to max_len in length-lexicographic order"""
+        return self.compile().enumerate_words(max_len)
+    
+    def stream(self):
+        """Return a StreamMatcher over the compiled automaton"""
+        return self.compile().stream()
+
+
+class CompiledDFA:
+    """
+    Table-driven matcher built from a deterministic FiniteAutomaton.
+    
+    States and symbols are mapped to dense integer ids and the transition
+    function is stored in a flat array indexed by state * |Sigma| + symbol_id,
+    with -1 marking a missing (dead) transition.
+    """
+    def __init__(self, dfa):
+        if not dfa.is_deterministic():
+            raise ValueError("CompiledDFA requires a deterministic automaton")
+        
+        # Give the initial state id 0 and number the rest in a stable order
+        states = [dfa.q0] + sorted(s for s in dfa.Q if s != dfa.q0)
+        self.state_ids = {state: i for i, state in enumerate(states)}
+        for (state, _), next_states in dfa.delta.items():
+            for s in [state] + _as_list(next_states):
+                self.state_ids.setdefault(s, len(self.state_ids))
+        self.symbols = sorted(dfa.Sigma)
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.num_states = len(self.state_ids)
+        self.num_symbols = len(self.symbols)
+        self.start = 0
+        
+        self.table = array('i', [-1]) * (self.num_states * self.num_symbols)
+        for (state, symbol), next_states in dfa.delta.items():
+            if symbol not in self.symbol_ids:
+                continue
+            for next_state in _as_list(next_states):
+                index = self.state_ids[state] * self.num_symbols + self.symbol_ids[symbol]
+                self.table[index] = self.state_ids[next_state]
+        
+        self.finals = bytearray(self.num_states)
+        for state in dfa.F:
+            if state in self.state_ids:
+                self.finals[self.state_ids[state]] = 1
+        
+        self._byte_table = None  # Built on first use by the byte_table property
+        self._np_tables = None  # Built on first use by _numpy_tables()
+    
+    def __getstate__(self):
+        # The derived tables are rebuilt on demand, so workers are not sent them
+        return dict(self.__dict__, _byte_table=None, _np_tables=None)
+    
+    @property
+    def byte_table(self):
+        """
+        Byte-level table for match_bytes(): one row of 256 entries per state,
+        so a byte steps the automaton without going through symbol_ids.
+        Built on first use, since it is 256 entries per state.
+        """
+        if self._byte_table is None:
+            byte_table = array('i', [-1]) * (self.num_states * 256)
+            for symbol, symbol_id in self.symbol_ids.items():
+                if len(symbol) != 1 or ord(symbol) > 255:
+                    continue
+                for state in range(self.num_states):
+                    byte_table[(state << 8) | ord(symbol)] = self.table[state * self.num_symbols + symbol_id]
+            self._byte_table = byte_table
+        return self._byte_table
+    
+    def match(self, string):
+        """Check whether a string is accepted by the automaton"""
+        state = self._run(self.start, string)
+        return state >= 0 and self.finals[state] == 1
+    
+    def _run(self, state, string):
+        """Step from a state over a string, returning the end state or -1 if it dies"""
+        table = self.table
+        symbol_ids = self.symbol_ids
+        num_symbols = self.num_symbols
+        for char in string:
+            symbol_id = symbol_ids.get(char)
+            if symbol_id is None:
+                return -1
+            state = table[state * num_symbols + symbol_id]
+            if state < 0:
+                return -1
+        return state
+    
+    def _run_bytes(self, state, buffer):
+        """Step from a state over a bytes-like buffer, returning the end state or -1"""
+        byte_table = self.byte_table
+        for byte in memoryview(buffer).cast('B'):
+            state = byte_table[(state << 8) | byte]
+            if state < 0:
+                return -1
+        return state
+    
+    def enumerate_words(self, max_len):
+        """
+        Yield every accepted word of length at most max_len in length-lexicographic order.
+        
+        viable[r][state] records whether some word of exactly r symbols leads
+        from the state to acceptance, so the depth-first walk for each length
+        never enters a prefix that cannot be completed. Memory is bounded by
+        the table and the current path, not by the number of words.
+        """
+        table = self.table
+        num_symbols = self.num_symbols
+        viable = [bytearray(self.finals)]
+        for _ in range(max_len):
+            previous = viable[-1]
+            viable.append(bytearray(
+                any(table[state * num_symbols + symbol_id] >= 0 and previous[table[state * num_symbols + symbol_id]]
+                    for symbol_id in range(num_symbols))
+                for state in range(self.num_states)
+            ))
+        
+        for length in range(max_len + 1):
+            if not viable[length][self.start]:
+                continue
+            
+            word = []
+            path = [self.start]  # States along the current prefix
+            next_symbols = [0]   # Next symbol id to try at each depth
+            while path:
+                state = path[-1]
+                depth = len(word)
+                symbol_id = next_symbols[-1]
+                if depth < length:
+                    remaining = viable[length - depth - 1]
+                    while symbol_id < num_symbols:
+                        next_state = table[state * num_symbols + symbol_id]
+                        if next_state >= 0 and remaining[next_state]:
+                            break
+                        symbol_id += 1
+                else:
+                    yield ''.join(word)
+                    symbol_id = num_symbols
                 
-                # Add transition from current_state_set to next_state_set with symbol
-                dfa_transitions[(current_state_frozen, symbol)] = next_state_frozen
+                if symbol_id == num_symbols:
+                    path.pop()
+                    next_symbols.pop()
+                    if word:
+                        word.pop()
+                    continue
                 
-                # If this is a new state, add it to the list of states
-                if next_state_frozen not in dfa_states:
-                    dfa_states.append(next_state_frozen)
-                    unmarked_states.append(next_state_set)
-                    
-                    # Check if this new state contains any final states
-                    if any(state in self.F for state in next_state_set):
-                        dfa_final_states.append(next_state_frozen)
+                next_symbols[-1] = symbol_id + 1
+                word.append(self.symbols[symbol_id])
+                path.append(next_state)
+                next_symbols.append(0)
+    
+    def stream(self):
+        """Return a StreamMatcher that consumes input chunk by chunk"""
+        return StreamMatcher(self)
+    
+    def scan_file(self, path, bitmap_path, buffer_size=1 << 16):
+        """
+        Match every newline-delimited record of a file and write the results as a bitmap.
+        
+        The file is memory-mapped and each record is stepped through the byte
+        table straight from the mapping, without decoding it to str. Bit i of
+        the bitmap (least significant bit first within each byte) is set when
+        record i is accepted. The bitmap is written in buffer_size pieces.
+        
+        Returns the number of records scanned.
+        """
+        start = self.start
+        finals = self.finals
+        records = 0
+        with open(path, 'rb') as corpus, open(bitmap_path, 'wb') as bitmap:
+            size = os.fstat(corpus.fileno()).st_size
+            if size == 0:
+                return 0
             
-            # Check if current state contains any final states
-            if any(state in self.F for state in current_state_set):
-                dfa_final_states.append(current_state_frozen)
+            with mmap.mmap(corpus.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    pending = bytearray()
+                    current_byte = 0
+                    position = 0
+                    while position < size:
+                        end = mapped.find(b'\n', position)
+                        if end < 0:
+                            end = size
+                        
+                        state = self._run_bytes(start, view[position:end])
+                        if state >= 0 and finals[state]:
+                            current_byte |= 1 << (records & 7)
+                        records += 1
+                        
+                        if records & 7 == 0:
+                            pending.append(current_byte)
+                            current_byte = 0
+                            if len(pending) >= buffer_size:
+                                bitmap.write(pending)
+                                pending.clear()
+                        position = end + 1
+                    
+                    if records & 7:
+                        pending.append(current_byte)
+                    bitmap.write(pending)
+                finally:
+                    view.release()
+        return records
+    
+    def match_many(self, strings, workers=1, chunk_size=10000):
+        """
+        Check many strings and return an array('B') of 0/1 results in input order.
         
-        # Convert frozen sets back to strings for easier visualization
-        state_mapping = {state: f"q{i}" for i, state in enumerate(dfa_states)}
+        The input is consumed in chunks of chunk_size strings. With more than
+        one worker the chunks are matched in a process pool that receives the
+        pickled transition table once, when each worker starts.
+        """
+        results = array('B')
+        chunks = _chunks(strings, chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                results.frombytes(_match_chunk_with(self, chunk))
+            return results
         
-        new_Q = list(state_mapping.values())
-        new_delta = {}
+        with Pool(workers, initializer=_init_match_worker, initargs=(self,)) as pool:
+            for chunk_results in pool.imap(_match_chunk, chunks):
+                results.frombytes(chunk_results)
+        return results
+    
+    def encode_batch(self, strings):
+        """
+        Encode strings as a 2-D symbol-id matrix for match_matrix() (requires numpy).
         
-        for (state_set, symbol), next_state_set in dfa_transitions.items():
-            new_delta[(state_mapping[state_set], symbol)] = state_mapping[next_state_set]
+        Shorter strings are padded with the id num_symbols, which leaves the
+        state unchanged, and characters outside the alphabet get the id
+        num_symbols + 1, which leads to the dead state.
+        """
+        import numpy as np
         
-        new_q0 = state_mapping[frozenset({self.q0})]
-        new_F = [state_mapping[state] for state in dfa_final_states]
+        strings = list(strings)
+        width = max(map(len, strings), default=0)
+        pad, invalid = self.num_symbols, self.num_symbols + 1
+        dtype = np.uint8 if invalid < 256 else np.uint16
         
-        return FiniteAutomaton(new_Q, self.Sigma, new_delta, new_q0, new_F)
+        # Decode every character as a code point in one pass over a padded buffer
+        buffer = ''.join(string.ljust(width, '\0') for string in strings)
+        codes = np.frombuffer(buffer.encode('utf-32-le'), dtype=np.uint32).reshape(len(strings), width)
+        
+        symbol_codes = np.array([ord(symbol) for symbol in self.symbols if len(symbol) == 1], dtype=np.uint32)
+        symbol_values = np.array([self.symbol_ids[symbol] for symbol in self.symbols if len(symbol) == 1], dtype=dtype)
+        order = np.argsort(symbol_codes)
+        symbol_codes, symbol_values = symbol_codes[order], symbol_values[order]
+        
+        positions = np.searchsorted(symbol_codes, codes).clip(max=max(len(symbol_codes) - 1, 0))
+        matrix = np.full(codes.shape, invalid, dtype=dtype)
+        if len(symbol_codes):
+            known = symbol_codes[positions] == codes
+            matrix[known] = symbol_values[positions[known]]
+        
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        matrix[np.arange(width) >= lengths[:, None]] = pad
+        return matrix
+    
+    def match_matrix(self, matrix):
+        """
+        Step every row of a symbol-id matrix through the automaton at once (requires numpy).
+        
+        Returns a boolean array with one entry per row.
+        """
+        import numpy as np
+        
+        table, finals = self._numpy_tables()
+        width = self.num_symbols + 2
+        states = np.zeros(matrix.shape[0], dtype=np.intp)
+        for column in matrix.T:
+            # One vectorized gather per position for the whole batch
+            states = table[states * width + column]
+        return finals[states]
+    
+    def match_numpy(self, strings):
+        """Check a batch of strings with the NumPy backend and return a boolean array"""
+        return self.match_matrix(self.encode_batch(strings))
+    
+    def _numpy_tables(self):
+        """Build (once) the flat NumPy table used by match_matrix()"""
+        import numpy as np
+        
+        if self._np_tables is None:
+            # Row num_states is an explicit dead state; column num_symbols is
+            # padding (stay put) and column num_symbols + 1 is an invalid symbol
+            dead = self.num_states
+            width = self.num_symbols + 2
+            table = np.full((self.num_states + 1, width), dead, dtype=np.intp)
+            if self.num_symbols:
+                dense = np.array(self.table, dtype=np.intp).reshape(self.num_states, self.num_symbols)
+                table[:dead, :self.num_symbols] = np.where(dense < 0, dead, dense)
+            table[:, self.num_symbols] = np.arange(self.num_states + 1)
+            finals = np.zeros(self.num_states + 1, dtype=bool)
+            finals[:dead] = np.frombuffer(bytes(self.finals), dtype=np.uint8) == 1
+            self._np_tables = (table.ravel(), finals)
+        return self._np_tables
+    
+    def match_bytes(self, buffer):
+        """Check whether a bytes-like buffer (one byte per symbol) is accepted"""
+        state = self._run_bytes(self.start, buffer)
+        return state >= 0 and self.finals[state] == 1
+
+
+class StreamMatcher:
+    """
+    Resumable matcher over a CompiledDFA.
+    
+    Input is given in chunks with feed(), either as str or as bytes-like
+    objects (one byte per symbol, as in CompiledDFA.match_bytes()), so inputs
+    read from files, sockets or mmaps never have to be held in memory at once.
+    """
+    def __init__(self, dfa):
+        self.dfa = dfa
+        self.state = dfa.start
+    
+    def feed(self, chunk):
+        """Consume the next chunk; returns False once no continuation can be accepted"""
+        if self.state >= 0:
+            if isinstance(chunk, str):
+                self.state = self.dfa._run(self.state, chunk)
+            else:
+                self.state = self.dfa._run_bytes(self.state, chunk)
+        return self.state >= 0
+    
+    def feed_file(self, file, chunk_size=1 << 16):
+        """Feed a file object chunk by chunk, stopping early if the input is rejected"""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk or not self.feed(chunk):
+                return self.state >= 0
+    
+    def result(self):
+        """Check whether the input fed so far is accepted"""
+        return self.state >= 0 and self.dfa.finals[self.state] == 1
+    
+    def reset(self):
+        """Start matching a new input"""
+        self.state = self.dfa.start
+
+
+class LazyDFA:
+    """
+    On-the-fly determinization of a FiniteAutomaton.
+    
+    Subset states are created the first time matching reaches them and kept in
+    a bounded LRU cache together with the transitions computed from them, so
+    memory stays bounded however large the full subset construction would be.
+    """
+    def __init__(self, automaton, max_states=10000):
+        if max_states < 1:
+            raise ValueError("max_states must be at least 1")
+        bits, self.rows, self.final_mask = automaton._subset_tables()
+        self.start = 1 << bits[automaton.q0]
+        self.max_states = max_states
+        self.cache = OrderedDict()  # Subset bitmask -> {symbol: next subset bitmask}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _transitions(self, mask):
+        """Return the cached transitions of a subset state, creating it on first visit"""
+        transitions = self.cache.get(mask)
+        if transitions is None:
+            transitions = self.cache[mask] = {}
+            if len(self.cache) > self.max_states:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.cache.move_to_end(mask)
+        return transitions
+    
+    def match(self, string):
+        """Check whether a string is accepted, determinizing only the states it visits"""
+        rows = self.rows
+        mask = self.start
+        for symbol in string:
+            row = rows.get(symbol)
+            if row is None:
+                return False
+            
+            transitions = self._transitions(mask)
+            next_mask = transitions.get(symbol)
+            if next_mask is None:
+                self.misses += 1
+                next_mask = transitions[symbol] = _step_mask(mask, row)
+            else:
+                self.hits += 1
+            
+            if not next_mask:
+                return False
+            mask = next_mask
+        return bool(mask & self.final_mask)
+    
+    def cache_info(self):
+        """Return the cache counters and the number of cached subset states"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "states": len(self.cache),
+            "max_states": self.max_states,
+        }
+    
+    def clear_cache(self):
+        """Drop every cached subset state and reset the counters"""
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+# Matcher installed in each pool worker by _init_match_worker()
+_worker_matcher = None
+
+
+def _init_match_worker(matcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match_chunk(chunk):
+    return _match_chunk_with(_worker_matcher, chunk)
+
+
+def _match_chunk_with(matcher, chunk):
+    match = matcher.match
+    return bytes(match(string) for string in chunk)
+
+
+def _chunks(iterable, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _completed_table(dfa):
+    """
+    Build a complete integer transition table for the reachable part of a DFA.
+    
+    State 0 is the initial state and the last state is an added dead state
+    that absorbs every missing transition.
+    """
+    symbols = sorted(dfa.Sigma)
+    state_ids = {dfa.q0: 0}
+    order = [dfa.q0]
+    table = []
+    for state in order:
+        row = []
+        for symbol in symbols:
+            next_states = dfa.get_transitions(state, symbol)
+            if not next_states:
+                row.append(None)
+                continue
+            next_state = next_states[0]
+            if next_state not in state_ids:
+                state_ids[next_state] = len(order)
+                order.append(next_state)
+            row.append(state_ids[next_state])
+        table.append(row)
+    
+    dead = len(table)
+    for row in table:
+        for i, next_state in enumerate(row):
+            if next_state is None:
+                row[i] = dead
+    table.append([dead] * len(symbols))
+    
+    final_states = set(dfa.F)
+    finals = [state in final_states for state in order] + [False]
+    return symbols, table, finals
+
+
+def _hopcroft_partition(table, finals, num_symbols):
+    """Return the block id of every state after Hopcroft's partition refinement"""
+    num_states = len(table)
+    
+    # inverse[symbol][state] lists the states that move to state on symbol
+    inverse = [[[] for _ in range(num_states)] for _ in range(num_symbols)]
+    for state, row in enumerate(table):
+        for symbol, next_state in enumerate(row):
+            inverse[symbol][next_state].append(state)
+    
+    accepting = {state for state in range(num_states) if finals[state]}
+    rejecting = set(range(num_states)) - accepting
+    blocks = [block for block in (accepting, rejecting) if block]
+    block_of = [0] * num_states
+    for block_id, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = block_id
+    
+    # Only the smaller of the two initial blocks is needed as a splitter
+    waiting = set()
+    if len(blocks) == 2:
+        smaller = 0 if len(blocks[0]) <= len(blocks[1]) else 1
+        waiting = {(smaller, symbol) for symbol in range(num_symbols)}
+    pending = list(waiting)
+    
+    while pending:
+        splitter = pending.pop()
+        waiting.discard(splitter)
+        block_id, symbol = splitter
+        
+        # Group the predecessors of the splitter block by their current block
+        touched = {}
+        for state in blocks[block_id]:
+            for predecessor in inverse[symbol][state]:
+                touched.setdefault(block_of[predecessor], set()).add(predecessor)
+        
+        for split_id, members in touched.items():
+            if len(members) == len(blocks[split_id]):
+                continue
+            
+            # Move the predecessors into a new block
+            new_id = len(blocks)
+            blocks[split_id] -= members
+            blocks.append(members)
+            for state in members:
+                block_of[state] = new_id
+            
+            for c in range(num_symbols):
+                if (split_id, c) in waiting:
+                    entry = (new_id, c)
+                elif len(members) <= len(blocks[split_id]):
+                    entry = (new_id, c)
+                else:
+                    entry = (split_id, c)
+                if entry not in waiting:
+                    waiting.add(entry)
+                    pending.append(entry)
+    
+    return block_of
+
+
+def _moore_partition(table, finals):
+    """Return the block id of every state after Moore's iterative refinement"""
+    block_of = [1 if final else 0 for final in finals]
+    num_blocks = len(set(block_of))
+    
+    while True:
+        signatures = {}
+        new_block_of = []
+        for state, row in enumerate(table):
+            signature = (block_of[state], tuple(block_of[next_state] for next_state in row))
+            new_block_of.append(signatures.setdefault(signature, len(signatures)))
+        
+        if len(signatures) == num_blocks:
+            return new_block_of
+        block_of, num_blocks = new_block_of, len(signatures)
+
+
+def _quotient_automaton(symbols, table, finals, block_of):
+    """
+    Build the FiniteAutomaton whose states are the blocks of a partition.
+    
+    The block of the dead state (the last state of the table) is dropped, so
+    the result only keeps states that can still reach a final state.
+    """
+    dead_block = block_of[len(table) - 1]
+    representative = {}
+    for state in range(len(table)):
+        representative.setdefault(block_of[state], state)
+    
+    # Number the blocks breadth-first from the initial state
+    names = {}
+    order = []
+    if block_of[0] != dead_block:
+        names[block_of[0]] = "q0"
+        order.append(block_of[0])
+    
+    new_delta = {}
+    for block in order:
+        row = table[representative[block]]
+        for symbol, next_state in zip(symbols, row):
+            next_block = block_of[next_state]
+            if next_block == dead_block:
+                continue
+            if next_block not in names:
+                names[next_block] = f"q{len(order)}"
+                order.append(next_block)
+            new_delta[(names[block], symbol)] = names[next_block]
+    
+    new_Q = [names[block] for block in order] or ["q0"]
+    new_F = [names[block] for block in order if finals[representative[block]]]
+    return FiniteAutomaton(new_Q, set(symbols), new_delta, "q0", new_F)
+
+
+def _step_mask(mask, row):
+    """Union the successor masks of every state set in a subset bitmask"""
+    result = 0
+    while mask:
+        low_bit = mask & -mask
+        result |= row[low_bit.bit_length() - 1]
+        mask ^= low_bit
+    return result
+
+
+class _Transitions(dict):
+    """A delta dict that tells its automaton about every write"""
+    
+    def __init__(self, owner, transitions):
+        super().__init__(transitions)
+        self._owner = owner
+    
+    def __setitem__(self, key, next_states):
+        super().__setitem__(key, next_states)
+        self._owner._transition_changed(key)
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._owner._transition_changed(key)
+    
+    # The C implementations of these methods bypass __setitem__ and __delitem__
+    def update(self, *args, **kwargs):
+        for key, next_states in dict(*args, **kwargs).items():
+            self[key] = next_states
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        next_states = self[key]
+        del self[key]
+        return next_states
+    
+    def popitem(self):
+        key, next_states = super().popitem()
+        self._owner._transition_changed(key)
+        return key, next_states
+    
+    def clear(self):
+        keys = list(self)
+        super().clear()
+        for key in keys:
+            self._owner._transition_changed(key)
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def _as_list(next_states):
+    """Normalize a delta value, which may be a single state or a list of states"""
+    return list(next_states) if isinstance(next_states, list) else [next_states]
 
 
 # Implementation for Variant 25
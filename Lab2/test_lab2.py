@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import itertools
+import random
+
+from lab2 import FiniteAutomaton, LazyDFA
+
+
+def random_nfa(rng, num_states, symbols):
+    """
+    Build a random NFA over states q0..q{n-1}.
+    """
+    states = [f"q{i}" for i in range(num_states)]
+    delta = {}
+    for state in states:
+        for symbol in symbols:
+            targets = rng.sample(states, rng.randrange(0, min(3, num_states + 1)))
+            if len(targets) == 1:
+                delta[(state, symbol)] = targets[0]
+            elif targets:
+                delta[(state, symbol)] = targets
+    finals = set(rng.sample(states, rng.randrange(0, num_states + 1)))
+    return FiniteAutomaton(set(states), set(symbols), delta, 'q0', finals)
+
+
+def nfa_accepts(fa, word):
+    """
+    Simulate the NFA directly on a word.
+    """
+    current = {fa.q0}
+    for symbol in word:
+        current = {target for state in current for target in fa.get_transitions(state, symbol)}
+    return bool(current & set(fa.F))
+
+
+def test_minimize_matches_moore_and_nfa():
+    """
+    Test Hopcroft against Moore minimization and the compiled matchers against NFA simulation.
+    """
+    rng = random.Random(4)
+    symbols = ['a', 'b']
+    words = [''.join(word) for length in range(7) for word in itertools.product(symbols, repeat=length)]
+
+    for _ in range(200):
+        fa = random_nfa(rng, rng.randrange(1, 7), symbols)
+        assert len(fa.minimize().Q) == len(fa._minimize_moore().Q)
+
+        compiled = fa.compile()
+        lazy = LazyDFA(fa, max_states=2)
+        expected = [nfa_accepts(fa, word) for word in words]
+        assert [compiled.match(word) for word in words] == expected
+        assert [lazy.match(word) for word in words] == expected
+        assert [bool(result) for result in fa.match_many(words)] == expected
+        assert list(fa.enumerate_words(6)) == [word for word, accepted in zip(words, expected) if accepted]
+
+
+def test_delta_writes_update_index():
+    """
+    Test that writing to delta in place keeps get_transitions() and compile() in sync.
+    """
+    fa = FiniteAutomaton({'q0', 'q1'}, {'a'}, {('q0', 'a'): 'q1'}, 'q0', {'q1'})
+    assert fa.compile().match('a') and not fa.compile().match('aaa')
+
+    fa.delta[('q1', 'a')] = 'q0'
+    assert fa.get_transitions('q1', 'a') == ['q0']
+    assert fa.compile().match('aaa')
+
+    fa.delta.update({('q1', 'a'): ['q0', 'q1']})
+    assert sorted(fa.get_transitions('q1', 'a')) == ['q0', 'q1']
+    assert not fa.is_deterministic()
+
+    del fa.delta[('q1', 'a')]
+    assert fa.get_transitions('q1', 'a') == []
+    assert fa.is_deterministic() and not fa.compile().match('aaa')
+
+
+def test_compile_cache_follows_attributes():
+    """
+    Test that changing F, q0, Sigma or Q after compile() is not served from the cache.
+    """
+    fa = FiniteAutomaton({'q0', 'q1'}, {'a'}, {('q0', 'a'): 'q1', ('q1', 'a'): 'q0'}, 'q0', {'q1'})
+    assert list(fa.match_many(['a', ''])) == [1, 0]
+
+    fa.F = {'q0'}
+    assert list(fa.match_many(['a', ''])) == [0, 1]
+
+    fa.q0 = 'q1'
+    assert list(fa.match_many(['a', ''])) == [1, 0]
+
+    fa.F.add('q1')
+    assert list(fa.match_many(['a', ''])) == [1, 1]
+
+    fa.Sigma = {'a', 'b'}
+    assert fa.compile().match('aa') and not fa.compile().match('b')
+
+    fa.Q = {'q0', 'q1', 'q2'}
+    fa.delta[('q2', 'a')] = 'q2'
+    assert fa.compile().match('a')
+
+
+if __name__ == "__main__":
+    test_minimize_matches_moore_and_nfa()
+    test_delta_writes_update_index()
+    test_compile_cache_follows_attributes()
+    print("Lab2 tests passed!")
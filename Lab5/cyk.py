@@ -0,0 +1,159 @@
+class CYKParser:
+    """
+    A CYK recognizer and parser for grammars in Chomsky Normal Form.
+
+    Non-terminals are interned to small integers and every chart cell is an
+    int bitmask of the non-terminals deriving that span. Binary rules are
+    precomputed into a (B, C) -> mask-of-A lookup, so combining two cells
+    only visits the pairs that actually occur in the grammar.
+
+    Attributes:
+        non_terminals (list): Non-terminal names, indexed by their id
+        start_symbol (str): The start symbol of the grammar
+    """
+
+    def __init__(self, grammar):
+        """
+        Build the lookup tables for a grammar.
+
+        Args:
+            grammar (Grammar): A grammar in Chomsky Normal Form
+        """
+        terminal_rules, binary_rules, self.nullable_start = grammar._cnf_rules()
+        self.non_terminals = sorted(terminal_rules)
+        self.ids = {nt: i for i, nt in enumerate(self.non_terminals)}
+        self.start_symbol = grammar.start_symbol
+
+        # terminal -> mask of every A with A -> terminal
+        self.terminal_masks = {}
+        for nt, terminals in terminal_rules.items():
+            for terminal in terminals:
+                self.terminal_masks[terminal] = self.terminal_masks.get(terminal, 0) | 1 << self.ids[nt]
+
+        # B -> {C -> mask of every A with A -> BC}, plus the mask of all such C
+        self.pair_masks = {}
+        self.right_masks = {}
+        for nt, pairs in binary_rules.items():
+            for left, right in pairs:
+                left_id, right_id = self.ids[left], self.ids[right]
+                by_right = self.pair_masks.setdefault(left_id, {})
+                by_right[right_id] = by_right.get(right_id, 0) | 1 << self.ids[nt]
+                self.right_masks[left_id] = self.right_masks.get(left_id, 0) | 1 << right_id
+
+    def _chart(self, tokens):
+        """
+        Fill the CYK chart for a token sequence.
+
+        Args:
+            tokens: Sequence of terminal symbols
+
+        Returns:
+            list: chart[length][start] is the mask of non-terminals deriving
+                tokens[start:start + length]
+        """
+        n = len(tokens)
+        chart = [None, [self.terminal_masks.get(token, 0) for token in tokens]]
+        pair_masks = self.pair_masks
+        right_masks = self.right_masks
+
+        for length in range(2, n + 1):
+            row = []
+            for start in range(n - length + 1):
+                mask = 0
+                for split in range(1, length):
+                    left = chart[split][start]
+                    if not left:
+                        continue
+                    right = chart[length - split][start + split]
+                    if not right:
+                        continue
+
+                    while left:
+                        low_bit = left & -left
+                        left ^= low_bit
+                        left_id = low_bit.bit_length() - 1
+                        candidates = right & right_masks.get(left_id, 0)
+                        while candidates:
+                            right_bit = candidates & -candidates
+                            candidates ^= right_bit
+                            mask |= pair_masks[left_id][right_bit.bit_length() - 1]
+                row.append(mask)
+            chart.append(row)
+
+        return chart
+
+    def recognize(self, tokens):
+        """
+        Check whether the grammar derives a token sequence.
+
+        Args:
+            tokens: A string or sequence of terminal symbols
+
+        Returns:
+            bool: True if the start symbol derives the tokens
+        """
+        if not tokens:
+            return self.nullable_start
+        if self.start_symbol not in self.ids:
+            return False
+
+        chart = self._chart(tokens)
+        return bool(chart[len(tokens)][0] >> self.ids[self.start_symbol] & 1)
+
+    def parse(self, tokens):
+        """
+        Parse a token sequence into a derivation tree.
+
+        Args:
+            tokens: A string or sequence of terminal symbols
+
+        Returns:
+            tuple: (symbol, children) where children is a list of subtrees
+                or, for a terminal rule, of the single terminal; None if the
+                tokens are not derived by the grammar
+        """
+        if not tokens:
+            return (self.start_symbol, []) if self.nullable_start else None
+        if self.start_symbol not in self.ids:
+            return None
+
+        chart = self._chart(tokens)
+        start_id = self.ids[self.start_symbol]
+        if not chart[len(tokens)][0] >> start_id & 1:
+            return None
+
+        root = (self.start_symbol, [])
+        stack = [(root, start_id, 0, len(tokens))]
+        while stack:
+            node, nt_id, start, length = stack.pop()
+            if length == 1:
+                node[1].append(tokens[start])
+                continue
+
+            left_id, right_id, split = self._find_split(chart, nt_id, start, length)
+            left = (self.non_terminals[left_id], [])
+            right = (self.non_terminals[right_id], [])
+            node[1].extend([left, right])
+            stack.append((right, right_id, start + split, length - split))
+            stack.append((left, left_id, start, split))
+
+        return root
+
+    def _find_split(self, chart, nt_id, start, length):
+        """
+        Find a rule A -> BC and a split point that derive a chart cell.
+
+        Returns:
+            tuple: (B id, C id, split length of the B part)
+        """
+        nt_bit = 1 << nt_id
+        for split in range(1, length):
+            left = chart[split][start]
+            right = chart[length - split][start + split]
+            for left_id, by_right in self.pair_masks.items():
+                if not left >> left_id & 1:
+                    continue
+                for right_id, mask in by_right.items():
+                    if mask & nt_bit and right >> right_id & 1:
+                        return left_id, right_id, split
+        raise ValueError("Chart cell has no derivation")
@@ -0,0 +1,191 @@
+class EarleyParser:
+    """
+    An Earley recognizer that works directly on the productions of a Grammar.
+
+    No CNF conversion is needed. ε-productions are handled with the
+    Aycock-Horspool rule: when a nullable non-terminal is predicted, the dot
+    is also moved past it. Right recursion is handled with Leo's
+    optimization, which memoizes deterministic reduction paths, so the
+    recognizer runs in linear time on LR-like grammars.
+
+    Items are (rule, dot, origin) tuples, where rule indexes self.rules.
+    """
+
+    def __init__(self, grammar):
+        """
+        Number the productions of a grammar and find the nullable symbols.
+
+        Args:
+            grammar (Grammar): Any context-free grammar
+        """
+        # Rules use the interned symbol ids of the grammar; rule 0 is the
+        # augmented start rule None -> S. Tokens are looked up among the
+        # terminals only, so a non-terminal name is never scanned.
+        ids = grammar.symbols.ids
+        self.symbol_ids = {terminal: ids[terminal] for terminal in grammar.terminals}
+        self.rules = [(None, (ids[grammar.start_symbol],))]
+        self.rules_by_lhs = {}
+        for nt, rhss in grammar.rules.items():
+            for rhs in rhss:
+                self.rules_by_lhs.setdefault(nt, []).append(len(self.rules))
+                self.rules.append((nt, rhs))
+
+        self.nullable = grammar._nullable_symbols()
+
+        # The symbols after the dot of a Leo item may only derive ε: a
+        # symbol that is merely nullable could still start a longer match,
+        # which needs the skipped intermediate items. empty_tail[rule] is
+        # the first position from which the rest of the rule derives only ε.
+        empty = self.nullable - _non_empty_symbols(grammar)
+        self.empty_tail = []
+        for _, rhs in self.rules:
+            tail = len(rhs)
+            while tail > 0 and rhs[tail - 1] in empty:
+                tail -= 1
+            self.empty_tail.append(tail)
+
+    def recognize(self, tokens):
+        """
+        Check whether the grammar derives a token sequence.
+
+        Args:
+            tokens: A string or sequence of terminal symbols
+
+        Returns:
+            bool: True if the start symbol derives the tokens
+        """
+        rules = self.rules
+        rules_by_lhs = self.rules_by_lhs
+        nullable = self.nullable
+        tokens = [self.symbol_ids.get(token, -1) for token in tokens]
+
+        # Per Earley set: the items in order, the same items as a set, and
+        # the items indexed by the symbol after their dot
+        items = [[]]
+        seen = [set()]
+        postdot = [{}]
+        leo = [{}]
+
+        def add(i, item):
+            if item in seen[i]:
+                return
+            seen[i].add(item)
+            items[i].append(item)
+            rhs = rules[item[0]][1]
+            if item[1] < len(rhs):
+                postdot[i].setdefault(rhs[item[1]], []).append(item)
+
+        add(0, (0, 0, 0))
+        for i in range(len(tokens) + 1):
+            worklist = items[i]
+            position = 0
+            while position < len(worklist):
+                rule, dot, origin = worklist[position]
+                position += 1
+                lhs, rhs = rules[rule]
+
+                if dot < len(rhs):
+                    symbol = rhs[dot]
+                    if symbol in rules_by_lhs:
+                        for predicted in rules_by_lhs[symbol]:
+                            add(i, (predicted, 0, i))
+                        if symbol in nullable:
+                            add(i, (rule, dot + 1, origin))
+                elif origin < i:
+                    # Completions with origin == i are nullable and were
+                    # already taken care of when the symbol was predicted
+                    top = self._leo_item(origin, lhs, postdot, leo)
+                    if top is not None:
+                        add(i, top)
+                    else:
+                        for waiting_rule, waiting_dot, waiting_origin in postdot[origin].get(lhs, ()):
+                            add(i, (waiting_rule, waiting_dot + 1, waiting_origin))
+
+            if i == len(tokens):
+                break
+
+            # Scan the next token into a new set
+            items.append([])
+            seen.append(set())
+            postdot.append({})
+            leo.append({})
+            for rule, dot, origin in postdot[i].get(tokens[i], ()):
+                add(i + 1, (rule, dot + 1, origin))
+            if not items[i + 1]:
+                return False
+
+        return (0, 1, 0) in seen[len(tokens)]
+
+    def _leo_item(self, j, symbol, postdot, leo):
+        """
+        Find the topmost item of the deterministic reduction path for a completion.
+
+        Completing `symbol` at origin j follows a deterministic path when set j
+        holds exactly one item waiting for `symbol` and every symbol after
+        `symbol` in its rule derives only ε. The completed item at the top of
+        that chain is memoized per (set, symbol), so each link is walked only
+        once.
+
+        Returns:
+            tuple: The completed item at the top of the chain, or None
+        """
+        chain = []
+        top = None
+        while True:
+            memo = leo[j]
+            if symbol in memo:
+                if memo[symbol] is not None:
+                    top = memo[symbol]
+                break
+
+            waiting = postdot[j].get(symbol, ())
+            if len(waiting) != 1:
+                memo[symbol] = None
+                break
+            rule, dot, origin = waiting[0]
+            if dot + 1 < self.empty_tail[rule]:
+                memo[symbol] = None
+                break
+
+            chain.append((j, symbol))
+            top = (rule, len(self.rules[rule][1]), origin)
+            symbol = self.rules[rule][0]
+            j = origin
+            if symbol is None:
+                break
+
+        for link_set, link_symbol in chain:
+            leo[link_set][link_symbol] = top
+        return top
+
+
+def _non_empty_symbols(grammar):
+    """
+    Find the ids of the non-terminals that derive a non-empty string of terminals.
+
+    A non-terminal qualifies when one of its productions is made only of
+    productive symbols and contains a terminal or a qualifying non-terminal,
+    so the set is found by a search backwards from the terminals.
+
+    Args:
+        grammar (Grammar): The grammar to analyse
+        
+    Returns:
+        set: Ids of the non-terminals with a non-empty derivation
+    """
+    productive = grammar._productive_symbols() | grammar._terminal_ids()
+    users = {}  # Symbol id -> non-terminals with a productive rule using it
+    for lhs, rhss in grammar.rules.items():
+        for rhs in rhss:
+            if all(symbol in productive for symbol in rhs):
+                for symbol in rhs:
+                    users.setdefault(symbol, set()).add(lhs)
+
+    found = set()
+    queue = list(grammar._terminal_ids())
+    while queue:
+        for lhs in users.get(queue.pop(), ()):
+            if lhs not in found:
+                found.add(lhs)
+                queue.append(lhs)
+    return found
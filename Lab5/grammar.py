@@ -1,11 +1,178 @@
+import random
+from collections import OrderedDict
+from functools import wraps
+from multiprocessing import Pool
+from types import MappingProxyType
+
+
+class SymbolTable:
+    """
+    A class that interns grammar symbols to integer ids.
+    
+    A grammar derived without new symbols shares the table of its parent.
+    Transformations that introduce symbols (S0, T_a, X_n) intern them into a
+    copy, so existing symbols keep their ids and a table never grows once a
+    grammar uses it.
+    
+    Attributes:
+        names (list): Symbol names, indexed by id
+        ids (dict): Dictionary mapping symbol names to ids
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty symbol table.
+        """
+        self.names = []
+        self.ids = {}
+    
+    def intern(self, name):
+        """
+        Return the id of a symbol, assigning a new one on first use.
+        
+        Args:
+            name (str): The symbol name
+            
+        Returns:
+            int: The id of the symbol
+        """
+        symbol_id = self.ids.get(name)
+        if symbol_id is None:
+            symbol_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol_id
+    
+    def copy(self):
+        """
+        Return a new table with the same ids, to intern new symbols into.
+        """
+        table = SymbolTable()
+        table.names = list(self.names)
+        table.ids = dict(self.ids)
+        return table
+    
+    def __len__(self):
+        return len(self.names)
+
+
+class PassCache:
+    """
+    A bounded LRU cache of the results of grammar transformations.
+    
+    Keys are (pass name, arguments, grammar). Grammars hash and compare by
+    content, so a pass run on a grammar equal to one seen before returns the
+    cached result without doing any work.
+    
+    Attributes:
+        max_entries (int): Number of results kept before the least recently
+            used one is evicted
+    """
+    
+    def __init__(self, max_entries=256):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries (int): Maximum number of cached results
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """
+        Look up a cached result and mark it as recently used.
+        
+        Args:
+            key (tuple): (pass name, arguments, grammar)
+            
+        Returns:
+            Grammar: The cached result, or None on a miss
+        """
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return result
+    
+    def put(self, key, result):
+        """
+        Store a result, evicting the least recently used one if the cache is full.
+        
+        Args:
+            key (tuple): (pass name, arguments, grammar)
+            result (Grammar): The result of the pass
+        """
+        self.entries[key] = result
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def cache_info(self):
+        """
+        Return the cache counters and the number of cached results.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+        }
+    
+    def clear_cache(self):
+        """
+        Drop every cached result and reset the counters.
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+# Results of the Grammar transformations, shared by all grammars
+pass_cache = PassCache()
+
+
+def _cached_pass(method):
+    """
+    Serve a Grammar transformation from pass_cache when possible.
+    """
+    @wraps(method)
+    def cached(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), self)
+        result = pass_cache.get(key)
+        if result is None:
+            result = method(self, *args, **kwargs)
+            pass_cache.put(key, result)
+        return result
+    return cached
+
+
 class Grammar:
     """
     A class to represent a context-free grammar and perform transformations to convert it to Chomsky Normal Form.
     
+    Productions are stored as tuples of interned symbol ids, so multi-character
+    symbols such as 'T_a', 'X_12' or 'S0' are single symbols and the
+    transformations never split them into characters.
+    
+    Grammars are immutable and hash by content. Transformations return the
+    grammar itself when there is nothing to do, and their results are kept
+    in pass_cache. Single-rule edits go through with_production() and
+    without_production(), which carry over every analysis (nullable,
+    productive and reachable symbols) that the edit cannot change.
+    
     Attributes:
-        non_terminals (set): Set of non-terminal symbols
-        terminals (set): Set of terminal symbols
-        productions (dict): Dictionary mapping non-terminals to lists of productions
+        non_terminals (frozenset): Set of non-terminal symbols
+        terminals (frozenset): Set of terminal symbols
+        symbols (SymbolTable): Interned symbols of the grammar
+        rules (mapping): Read-only mapping from non-terminal ids to tuples of
+            productions as tuples of symbol ids (the empty tuple is ε)
         start_symbol (str): The start symbol of the grammar
     """
     
@@ -19,10 +186,146 @@ class Grammar:
             productions (dict): Dictionary mapping non-terminals to lists of productions
             start_symbol (str): The start symbol of the grammar
         """
-        self.non_terminals = non_terminals if non_terminals else set()
-        self.terminals = terminals if terminals else set()
-        self.productions = productions if productions else {}
+        self.non_terminals = frozenset(non_terminals or ())
+        self.terminals = frozenset(terminals or ())
         self.start_symbol = start_symbol
+        self.symbols = SymbolTable()
+        for symbol in sorted(self.non_terminals) + sorted(self.terminals):
+            self.symbols.intern(symbol)
+        if start_symbol is not None:
+            self.symbols.intern(start_symbol)
+        self.rules = self._intern_productions(productions or {})
+        self._key = None
+        self._hash = None
+        self._analyses = {}
+    
+    @classmethod
+    def _from_rules(cls, symbols, non_terminals, terminals, rules, start_symbol):
+        """
+        Create a Grammar object directly from interned rules.
+        
+        Args:
+            symbols (SymbolTable): The symbol table the rules refer to, with every symbol interned
+            non_terminals (set): Set of non-terminal symbols
+            terminals (set): Set of terminal symbols
+            rules (dict): Dictionary mapping non-terminal ids to tuples of symbol ids
+            start_symbol (str): The start symbol of the grammar
+            
+        Returns:
+            Grammar: The new grammar
+        """
+        grammar = cls.__new__(cls)
+        grammar.non_terminals = frozenset(non_terminals)
+        grammar.terminals = frozenset(terminals)
+        grammar.start_symbol = start_symbol
+        grammar.symbols = symbols
+        grammar.rules = MappingProxyType({lhs: tuple(rhss) for lhs, rhss in rules.items()})
+        grammar._key = None
+        grammar._hash = None
+        grammar._analyses = {}
+        return grammar
+    
+    def __setattr__(self, name, value):
+        # Public attributes are set once, while the grammar is constructed
+        if not name.startswith('_') and name in self.__dict__:
+            raise AttributeError(f"Grammar is immutable, cannot set '{name}'")
+        object.__setattr__(self, name, value)
+    
+    def __getstate__(self):
+        # The read-only rules view cannot be pickled, and the caches are cheap to rebuild
+        return dict(self.__dict__, rules=dict(self.rules), _key=None, _hash=None, _analyses={})
+    
+    def __setstate__(self, state):
+        state['rules'] = MappingProxyType(state['rules'])
+        self.__dict__.update(state)
+    
+    def _content_key(self):
+        """
+        Return the content of the grammar as a hashable tuple of symbol names.
+        
+        The key does not depend on symbol ids, so grammars built separately
+        from the same productions are equal.
+        """
+        if self._key is None:
+            names = self.symbols.names
+            self._key = (
+                self.start_symbol,
+                self.non_terminals,
+                self.terminals,
+                tuple(sorted(
+                    (names[lhs], tuple(tuple(names[symbol] for symbol in rhs) for rhs in rhss))
+                    for lhs, rhss in self.rules.items() if rhss
+                )),
+            )
+        return self._key
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Grammar):
+            return NotImplemented
+        return hash(self) == hash(other) and self._content_key() == other._content_key()
+    
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._content_key())
+        return self._hash
+    
+    @property
+    def productions(self):
+        """
+        Dictionary mapping non-terminals to lists of productions as strings.
+        
+        The dictionary is rebuilt from rules on every access, so read it once
+        rather than inside a loop.
+        """
+        names = self.symbols.names
+        return {
+            names[lhs]: [self._production_string(rhs) for rhs in rhss]
+            for lhs, rhss in self.rules.items()
+        }
+    
+    def _intern_productions(self, productions):
+        """
+        Split every production string into symbols and intern them.
+        
+        Args:
+            productions (dict): Dictionary mapping non-terminals to lists of productions
+            
+        Returns:
+            mapping: Read-only mapping from non-terminal ids to tuples of productions
+        """
+        known = self.non_terminals | self.terminals
+        longest = max((len(symbol) for symbol in known), default=1)
+        intern = self.symbols.intern
+        return MappingProxyType({
+            intern(nt): tuple(
+                tuple(intern(symbol) for symbol in _split_production(prod, known, longest))
+                for prod in prods
+            )
+            for nt, prods in productions.items()
+        })
+    
+    def _production_string(self, rhs):
+        """
+        Join an interned production back into a string ('ε' if it is empty).
+        """
+        names = self.symbols.names
+        return ''.join(names[symbol] for symbol in rhs) if rhs else 'ε'
+    
+    def _non_terminal_ids(self):
+        """
+        Return the ids of the non-terminals, in id order.
+        """
+        ids = self.symbols.ids
+        return sorted(ids[nt] for nt in self.non_terminals)
+    
+    def _terminal_ids(self):
+        """
+        Return the set of ids of the terminals.
+        """
+        ids = self.symbols.ids
+        return {ids[t] for t in self.terminals}
     
     def __str__(self):
         """
@@ -36,8 +339,9 @@ class Grammar:
         result += f"Start symbol: {self.start_symbol}\n"
         result += "Productions:\n"
         
-        for nt in sorted(self.productions.keys()):
-            for prod in sorted(self.productions[nt]):
+        productions = self.productions  # Built once; the property rebuilds it on every access
+        for nt in sorted(productions):
+            for prod in sorted(productions[nt]):
                 result += f"  {nt} -> {prod}\n"
         
         return result
@@ -123,93 +427,491 @@ class Grammar:
         
         return cls(non_terminals, terminals, productions, start_symbol)
     
-    def eliminate_epsilon_productions(self):
+    def derive_word(self, rng=None, max_length=None):
         """
-        Eliminate ε-productions from the grammar.
+        Derive a random word with a leftmost derivation.
         
+        The sentential form is kept as the emitted terminals plus a stack of
+        pending symbols, so every rewrite only touches the top of the stack.
+        
+        Args:
+            rng (random.Random): Random generator to draw productions from
+            max_length (int): Give up once the word grows past this length
+            
         Returns:
-            Grammar: A new Grammar object without ε-productions
+            str: The derived word, or None if it grew past max_length
         """
-        # Step 1: Find all nullable symbols (symbols that can derive ε)
-        nullable = set()
-        
-        # Initially, add all symbols that directly produce ε
-        for nt, prods in self.productions.items():
-            if 'ε' in prods:
-                nullable.add(nt)
-        
-        # Iteratively find all nullable symbols
-        changed = True
-        while changed:
-            changed = False
-            for nt, prods in self.productions.items():
-                if nt in nullable:
+        rng = rng or random
+        names = self.symbols.names
+        non_terminal_ids = set(self._non_terminal_ids())
+        output = []
+        stack = [self.symbols.ids[self.start_symbol]]
+        
+        while stack:
+            symbol = stack.pop()
+            rhss = self.rules.get(symbol) if symbol in non_terminal_ids else None
+            if not rhss:
+                output.append(names[symbol])
+                if max_length is not None and len(output) > max_length:
+                    return None
+                continue
+            
+            stack.extend(reversed(rng.choice(rhss)))
+        
+        return ''.join(output)
+    
+    def generate(self, n, seed=0, max_length=None, workers=1, path=None, chunk_size=1000):
+        """
+        Generate a reproducible batch of words, optionally across a process pool.
+        
+        Word i draws from its own random stream seeded with (seed, i), so
+        the words depend only on the seed, not on the number of workers or
+        on chunk_size.
+        
+        Args:
+            n (int): Number of words to generate
+            seed: Seed of the batch
+            max_length (int): Maximum word length; longer derivations are retried
+            workers (int): Number of worker processes
+            path (str): If given, write the words to this file, one per line
+            chunk_size (int): Number of words per chunk
+            
+        Returns:
+            Iterator over the words, or the number of words written to path
+        """
+        tasks = [
+            (seed, start, min(chunk_size, n - start), max_length)
+            for start in range(0, n, chunk_size)
+        ]
+        words = _generate_chunks(self, tasks, workers)
+        if path is None:
+            return words
+        
+        with open(path, 'w') as file:
+            for word in words:
+                file.write(word)
+                file.write('\n')
+        return n
+    
+    def _cnf_rules(self):
+        """
+        Split the productions of a CNF grammar into terminal and binary rules.
+        
+        Returns:
+            tuple: (terminal_rules, binary_rules, nullable_start) where
+                terminal_rules maps a non-terminal to its terminals and
+                binary_rules maps it to its (B, C) pairs
+        """
+        names = self.symbols.names
+        terminal_rules = {nt: [] for nt in self.non_terminals}
+        binary_rules = {nt: [] for nt in self.non_terminals}
+        nullable_start = False
+        
+        for lhs, rhss in self.rules.items():
+            nt = names[lhs]
+            for rhs in rhss:
+                symbols = [names[symbol] for symbol in rhs]
+                if not symbols and nt == self.start_symbol:
+                    nullable_start = True
+                elif len(symbols) == 1 and symbols[0] in self.terminals:
+                    terminal_rules.setdefault(nt, []).append(symbols[0])
+                elif len(symbols) == 2 and all(symbol in self.non_terminals for symbol in symbols):
+                    binary_rules.setdefault(nt, []).append(tuple(symbols))
+                else:
+                    raise ValueError(f"Production {nt} -> {self._production_string(rhs)} is not in Chomsky Normal Form")
+        
+        return terminal_rules, binary_rules, nullable_start
+    
+    def _count_derivations(self, n):
+        """
+        Count the derivation trees of every non-terminal for word lengths 0..n.
+        
+        Args:
+            n (int): Maximum word length
+            
+        Returns:
+            tuple: (counts, terminal_rules, binary_rules) where counts[A][k]
+                is the number of derivation trees of A yielding k terminals
+        """
+        terminal_rules, binary_rules, nullable_start = self._cnf_rules()
+        counts = {nt: [0] * (n + 1) for nt in terminal_rules}
+        if nullable_start:
+            counts[self.start_symbol][0] = 1
+        
+        for nt, terminals in terminal_rules.items():
+            if n >= 1:
+                counts[nt][1] = len(terminals)
+        
+        for length in range(2, n + 1):
+            for nt, pairs in binary_rules.items():
+                total = 0
+                for left, right in pairs:
+                    left_counts, right_counts = counts[left], counts[right]
+                    for split in range(1, length):
+                        total += left_counts[split] * right_counts[length - split]
+                counts[nt][length] = total
+        
+        return counts, terminal_rules, binary_rules
+    
+    def count_words(self, n):
+        """
+        Count the derivations of words of length exactly n (CNF grammars only).
+        
+        For an unambiguous grammar this is the number of words of length n.
+        
+        Args:
+            n (int): Word length
+            
+        Returns:
+            int: Number of derivation trees of the start symbol yielding n terminals
+        """
+        counts, _, _ = self._count_derivations(n)
+        return counts[self.start_symbol][n] if self.start_symbol in counts else 0
+    
+    def uniform_words(self, n, count, rng=None):
+        """
+        Sample words of length exactly n uniformly from a CNF grammar.
+        
+        Each derivation tree yielding n terminals is equally likely (so each
+        word is, if the grammar is unambiguous). Rules and split points are
+        drawn in proportion to the precomputed derivation counts, so no
+        sample is ever rejected.
+        
+        Args:
+            n (int): Word length
+            count (int): Number of words to sample
+            rng (random.Random): Random generator to draw from
+            
+        Yields:
+            str: The sampled words
+        """
+        rng = rng or random
+        counts, terminal_rules, binary_rules = self._count_derivations(n)
+        if self.start_symbol not in counts or counts[self.start_symbol][n] == 0:
+            raise ValueError(f"The grammar derives no words of length {n}")
+        
+        for _ in range(count):
+            output = []
+            stack = [(self.start_symbol, n)]
+            while stack:
+                nt, length = stack.pop()
+                if length == 0:
+                    continue
+                if length == 1:
+                    output.append(rng.choice(terminal_rules[nt]))
                     continue
                 
-                for prod in prods:
-                    if all(symbol in nullable for symbol in prod):
-                        nullable.add(nt)
-                        changed = True
+                pick = rng.randrange(counts[nt][length])
+                for left, right in binary_rules[nt]:
+                    for split in range(1, length):
+                        pick -= counts[left][split] * counts[right][length - split]
+                        if pick < 0:
+                            break
+                    if pick < 0:
                         break
+                
+                # Expand the left child first to keep the output in order
+                stack.append((right, length - split))
+                stack.append((left, split))
+            yield ''.join(output)
+    
+    def _nullable_symbols(self):
+        """
+        Find the ids of the non-terminals that derive ε.
+        
+        Returns:
+            frozenset: Ids of the nullable non-terminals
+        """
+        if 'nullable' not in self._analyses:
+            self._analyses['nullable'] = frozenset(_derivable(self.rules, set()))
+        return self._analyses['nullable']
+    
+    def _productive_symbols(self):
+        """
+        Find the ids of the non-terminals that derive a string of terminals.
+        
+        Returns:
+            frozenset: Ids of the productive non-terminals
+        """
+        if 'productive' not in self._analyses:
+            self._analyses['productive'] = frozenset(_derivable(self.rules, self._terminal_ids()))
+        return self._analyses['productive']
+    
+    def _reachable_symbols(self):
+        """
+        Find the ids of the symbols reachable from the start symbol.
+        
+        Every production is visited at most once, when its left-hand side is
+        first reached.
+        
+        Returns:
+            frozenset: Ids of the reachable non-terminals and terminals
+        """
+        if 'reachable' in self._analyses:
+            return self._analyses['reachable']
+        if self.start_symbol is None:
+            # A grammar without a start symbol reaches nothing
+            self._analyses['reachable'] = frozenset()
+            return self._analyses['reachable']
+        
+        known = set(self._non_terminal_ids()) | self._terminal_ids()
+        start = self.symbols.ids[self.start_symbol]
+        reachable = {start}
+        queue = [start]
+        while queue:
+            nt = queue.pop()
+            for rhs in self.rules.get(nt, ()):
+                for symbol in rhs:
+                    if symbol not in reachable and symbol in known:
+                        reachable.add(symbol)
+                        queue.append(symbol)
+        self._analyses['reachable'] = frozenset(reachable)
+        return self._analyses['reachable']
+    
+    def with_production(self, nt, prod):
+        """
+        Return a copy of the grammar with one more production.
+        
+        Args:
+            nt (str): The non-terminal on the left-hand side
+            prod (str): The production to add ('ε' for the empty one)
+            
+        Returns:
+            Grammar: The edited grammar, or this grammar if it already has the production
+        """
+        lhs, rhs = self._edit_rule(nt, prod)
+        rhss = self.rules.get(lhs, ())
+        if rhs in rhss:
+            return self
+        
+        rules = dict(self.rules)
+        rules[lhs] = rhss + (rhs,)
+        grammar = Grammar._from_rules(self.symbols, self.non_terminals, self.terminals, rules, self.start_symbol)
+        grammar._analyses = self._edited_analyses(lhs, rhs, added=True)
+        return grammar
+    
+    def without_production(self, nt, prod):
+        """
+        Return a copy of the grammar with one production removed.
+        
+        Args:
+            nt (str): The non-terminal on the left-hand side
+            prod (str): The production to remove ('ε' for the empty one)
+            
+        Returns:
+            Grammar: The edited grammar
+        """
+        lhs, rhs = self._edit_rule(nt, prod)
+        rhss = self.rules.get(lhs, ())
+        if rhs not in rhss:
+            raise ValueError(f"{nt} -> {prod} is not a production of the grammar")
+        
+        rules = dict(self.rules)
+        rules[lhs] = tuple(other for other in rhss if other != rhs)
+        if not rules[lhs]:
+            del rules[lhs]
+        grammar = Grammar._from_rules(self.symbols, self.non_terminals, self.terminals, rules, self.start_symbol)
+        grammar._analyses = self._edited_analyses(lhs, rhs, added=False)
+        return grammar
+    
+    def _edit_rule(self, nt, prod):
+        """
+        Intern the production of a single-rule edit.
+        
+        Args:
+            nt (str): The non-terminal on the left-hand side
+            prod (str): The production
+            
+        Returns:
+            tuple: (id of the non-terminal, production as a tuple of symbol ids)
+        """
+        if nt not in self.non_terminals:
+            raise ValueError(f"Unknown non-terminal {nt}")
+        
+        known = self.non_terminals | self.terminals
+        longest = max((len(symbol) for symbol in known), default=1)
+        symbols = _split_production(prod, known, longest)
+        for symbol in symbols:
+            if symbol not in known:
+                raise ValueError(f"Unknown symbol {symbol} in production {nt} -> {prod}")
+        
+        ids = self.symbols.ids
+        return ids[nt], tuple(ids[symbol] for symbol in symbols)
+    
+    def _edited_analyses(self, lhs, rhs, added):
+        """
+        Carry the analyses of this grammar over to a copy with one rule added or removed.
+        
+        An analysis is kept whenever the edited rule cannot change it: a new
+        rule only matters if its left-hand side is not derivable yet but all
+        of its symbols are, and a removed rule only matters if its left-hand
+        side was derivable and the rule could have been used to derive it.
+        Reachability only changes through rules of reachable non-terminals.
+        Analyses that are not kept are recomputed on first use.
+        
+        Args:
+            lhs (int): Id of the edited rule's non-terminal
+            rhs (tuple): The edited production
+            added (bool): True if the rule was added, False if it was removed
+            
+        Returns:
+            dict: The analyses that still hold for the edited grammar
+        """
+        analyses = {}
+        for name, base in (('nullable', set()), ('productive', self._terminal_ids())):
+            derived = self._analyses.get(name)
+            if derived is None:
+                continue
+            usable = all(symbol in derived or symbol in base for symbol in rhs)
+            if not usable or (lhs in derived) == added:
+                analyses[name] = derived
+        
+        reachable = self._analyses.get('reachable')
+        if reachable is not None:
+            if lhs not in reachable or (added and all(symbol in reachable for symbol in rhs)):
+                analyses['reachable'] = reachable
+        
+        return analyses
+    
+    @_cached_pass
+    def eliminate_epsilon_productions(self, binarize=False):
+        """
+        Eliminate ε-productions from the grammar.
+        
+        A production with k nullable symbols has up to 2^k variants. With
+        binarize=True, productions longer than two symbols are split first
+        (the BIN step before DEL), so each production has at most three
+        variants and the result grows only linearly.
+        
+        Args:
+            binarize (bool): Binarize long productions before eliminating ε
+            
+        Returns:
+            Grammar: A new Grammar object without ε-productions
+        """
+        if self._is_epsilon_free():
+            return self
+        if binarize:
+            return self._binarize().eliminate_epsilon_productions()
+        
+        # Step 1: Find all nullable symbols (symbols that can derive ε)
+        nullable = self._nullable_symbols()
         
         # Step 2: Create new productions without ε-productions
-        new_productions = {}
+        new_rules = {}
         
-        for nt, prods in self.productions.items():
-            new_prods = []
+        for nt, rhss in self.rules.items():
+            new_rhss = {}  # Dict keys deduplicate the variants in order
             
-            for prod in prods:
-                if prod == 'ε':
+            for rhs in rhss:
+                if not rhs:
                     continue  # Skip ε-productions
                 
                 # Generate all possible combinations by removing nullable symbols
-                self._add_combinations(prod, nullable, 0, '', new_prods)
+                new_rhss.update(self._epsilon_variants(rhs, nullable))
             
-            if new_prods:
-                new_productions[nt] = new_prods
+            if new_rhss:
+                new_rules[nt] = list(new_rhss)
         
-        # Create a new grammar without ε-productions
-        new_grammar = Grammar(
-            non_terminals=self.non_terminals.copy(),
-            terminals=self.terminals.copy(),
-            productions=new_productions,
-            start_symbol=self.start_symbol
-        )
+        non_terminals = set(self.non_terminals)
+        start_symbol = self.start_symbol
+        symbols = self.symbols
         
-        # If the start symbol is nullable, add a new production S' -> ε
-        if self.start_symbol in nullable:
-            if 'S0' not in new_grammar.non_terminals:
-                new_grammar.non_terminals.add('S0')
-                new_grammar.productions['S0'] = [self.start_symbol, 'ε']
-                new_grammar.start_symbol = 'S0'
+        # If the start symbol is nullable, add a new production S0 -> S | ε
+        start_id = self.symbols.ids.get(self.start_symbol)
+        if start_id in nullable and 'S0' not in non_terminals:
+            symbols = symbols.copy()
+            non_terminals.add('S0')
+            new_rules[symbols.intern('S0')] = [(start_id,), ()]
+            start_symbol = 'S0'
         
-        return new_grammar
+        # Create a new grammar without ε-productions
+        return Grammar._from_rules(symbols, non_terminals, self.terminals, new_rules, start_symbol)
+    
+    def _is_epsilon_free(self):
+        """
+        Check that the only ε-production is S -> ε, with S on no right-hand side.
+        """
+        start_id = self.symbols.ids.get(self.start_symbol)
+        nullable_start = start_on_rhs = False
+        for nt, rhss in self.rules.items():
+            for rhs in rhss:
+                if not rhs:
+                    if nt != start_id:
+                        return False
+                    nullable_start = True
+                elif start_id in rhs:
+                    start_on_rhs = True
+        return not (nullable_start and start_on_rhs)
     
-    def _add_combinations(self, prod, nullable, pos, current, result):
+    def _epsilon_variants(self, prod, nullable):
         """
-        Helper method to generate all possible combinations by removing nullable symbols.
+        Generate every variant of a production with some nullable symbols removed.
+        
+        Variants are built left to right into a dict, so identical variants
+        (e.g. from repeated nullable symbols) are merged as soon as they appear
+        and no recursion is needed.
         
         Args:
-            prod (str): The production to process
-            nullable (set): Set of nullable symbols
-            pos (int): Current position in the production
-            current (str): Current combination being built
-            result (list): List to store the resulting combinations
+            prod (tuple): The production to process
+            nullable (set): Set of nullable symbol ids
+            
+        Returns:
+            dict: The non-empty variants as keys, in order
+        """
+        variants = {(): None}
+        for symbol in prod:
+            extended = {}
+            for variant in variants:
+                # Always include the current symbol
+                extended[variant + (symbol,)] = None
+                
+                # If the symbol is nullable, also try skipping it
+                if symbol in nullable:
+                    extended[variant] = None
+            variants = extended
+        
+        variants.pop((), None)  # Don't add empty string as a production
+        return variants
+    
+    def _binarize(self):
         """
-        if pos == len(prod):
-            if current:  # Don't add empty string as a production
-                result.append(current)
-            return
+        Split every production longer than two symbols into a chain of binary ones.
+        
+        A -> X1 X2 ... Xn becomes A -> X1 B1, B1 -> X2 B2, ..., with fresh
+        non-terminals named X_n. Each suffix gets a single non-terminal, so
+        productions ending in the same symbols share the tail of their chain.
         
-        symbol = prod[pos]
+        Returns:
+            Grammar: A new Grammar object whose productions have at most two symbols
+        """
+        non_terminals = set(self.non_terminals)
+        symbols = self.symbols.copy()
+        new_rules = {}
+        suffixes = {}  # Maps suffixes of long productions to their X_n
+        counter = 1
         
-        # Always include the current symbol
-        self._add_combinations(prod, nullable, pos + 1, current + symbol, result)
+        for nt, rhss in self.rules.items():
+            new_rhss = new_rules.setdefault(nt, [])
+            for rhs in rhss:
+                # Walk the suffixes right to left, reusing the X_n of any seen before
+                split = len(rhs) - 2
+                tail = rhs[split:] if split > 0 else rhs
+                while split > 0:
+                    suffix = rhs[split:]
+                    if suffix in suffixes:
+                        tail = (rhs[split - 1], suffixes[suffix])
+                    else:
+                        new_id, counter = _fresh_symbol(symbols, non_terminals, self.terminals, 'X', counter)
+                        new_rules[new_id] = [tail]
+                        suffixes[suffix] = new_id
+                        tail = (rhs[split - 1], new_id)
+                    split -= 1
+                new_rhss.append(tail)
         
-        # If the symbol is nullable, also try skipping it
-        if symbol in nullable:
-            self._add_combinations(prod, nullable, pos + 1, current, result)
+        return Grammar._from_rules(symbols, non_terminals, self.terminals, new_rules, self.start_symbol)
     
+    @_cached_pass
     def eliminate_renaming(self):
         """
         Eliminate unit productions (renaming) from the grammar.
@@ -217,55 +919,52 @@ class Grammar:
         Returns:
             Grammar: A new Grammar object without unit productions
         """
-        # Find all unit pairs (A, B) such that A =>* B
-        unit_pairs = {}
+        non_terminal_ids = self._non_terminal_ids()
+        is_non_terminal = set(non_terminal_ids)
         
-        # Initialize with direct unit productions
-        for nt in self.non_terminals:
-            unit_pairs[nt] = {nt}  # Every non-terminal can derive itself
-            
-            if nt in self.productions:
-                for prod in self.productions[nt]:
-                    if len(prod) == 1 and prod in self.non_terminals:
-                        unit_pairs[nt].add(prod)
-        
-        # Find all unit pairs using transitive closure
-        changed = True
-        while changed:
-            changed = False
-            for a in self.non_terminals:
-                for b in list(unit_pairs.get(a, set())):
-                    for c in list(unit_pairs.get(b, set())):
-                        if c not in unit_pairs.get(a, set()):
-                            if a not in unit_pairs:
-                                unit_pairs[a] = set()
-                            unit_pairs[a].add(c)
-                            changed = True
-        
-        # Create new productions without unit productions
-        new_productions = {}
-        
-        for a in self.non_terminals:
-            new_prods = []
+        # Build the unit-production graph A -> B for every A -> B
+        unit_edges = {nt: [] for nt in non_terminal_ids}
+        for nt in non_terminal_ids:
+            for rhs in self.rules.get(nt, ()):
+                if len(rhs) == 1 and rhs[0] in is_non_terminal:
+                    unit_edges[nt].append(rhs[0])
+        if not any(unit_edges.values()):
+            return self
+        
+        # A =>* B for every B reachable in the unit graph. Non-terminals in
+        # the same strongly connected component derive the same productions,
+        # and components come out successors first, so each component merges
+        # its own non-unit productions with the already deduplicated sets of
+        # the components it points to.
+        new_rules = {}
+        collected = []  # Deduplicated productions of every component
+        component_of = {}
+        for component in _strongly_connected_components(non_terminal_ids, unit_edges):
+            current = len(collected)
+            for a in component:
+                component_of[a] = current
             
-            for b in unit_pairs.get(a, set()):
-                if b in self.productions:
-                    for prod in self.productions[b]:
-                        # Skip unit productions
-                        if len(prod) != 1 or prod not in self.non_terminals:
-                            new_prods.append(prod)
+            # Dict keys keep the first occurrence of each production in order
+            new_rhss = {}
+            for a in component:
+                for rhs in self.rules.get(a, ()):
+                    # Skip unit productions
+                    if len(rhs) != 1 or rhs[0] not in is_non_terminal:
+                        new_rhss[rhs] = None
+            for a in component:
+                for b in unit_edges[a]:
+                    if component_of[b] != current:
+                        new_rhss.update(collected[component_of[b]])
+            collected.append(new_rhss)
             
-            if new_prods:
-                new_productions[a] = new_prods
+            if new_rhss:
+                for a in component:
+                    new_rules[a] = list(new_rhss)
         
         # Create a new grammar without unit productions
-        return Grammar(
-            non_terminals=self.non_terminals.copy(),
-            terminals=self.terminals.copy(),
-            productions=new_productions,
-            start_symbol=self.start_symbol
-        )
+        return Grammar._from_rules(self.symbols, self.non_terminals, self.terminals, new_rules, self.start_symbol)
     
+    @_cached_pass
     def eliminate_inaccessible_symbols(self):
         """
         Eliminate inaccessible symbols from the grammar.
@@ -273,46 +972,33 @@ class Grammar:
         Returns:
             Grammar: A new Grammar object without inaccessible symbols
         """
+        names = self.symbols.names
+        
         # Find all accessible symbols starting from the start symbol
-        accessible = {self.start_symbol}
-        
-        # Iteratively find all accessible symbols
-        changed = True
-        while changed:
-            changed = False
-            for nt in list(accessible):
-                if nt in self.productions:
-                    for prod in self.productions[nt]:
-                        for symbol in prod:
-                            if symbol not in accessible and (symbol in self.non_terminals or symbol in self.terminals):
-                                accessible.add(symbol)
-                                changed = True
+        accessible = self._reachable_symbols()
         
         # Create new sets of non-terminals and terminals
-        new_non_terminals = self.non_terminals.intersection(accessible)
-        new_terminals = self.terminals.intersection(accessible)
+        accessible_names = {names[symbol] for symbol in accessible}
+        if accessible_names >= self.non_terminals | self.terminals:
+            return self
+        new_non_terminals = self.non_terminals.intersection(accessible_names)
+        new_terminals = self.terminals.intersection(accessible_names)
         
         # Create new productions without inaccessible symbols
-        new_productions = {}
-        for nt in new_non_terminals:
-            if nt in self.productions:
-                new_prods = []
-                for prod in self.productions[nt]:
-                    # Check if all symbols in the production are accessible
-                    if all(symbol in accessible or symbol == 'ε' for symbol in prod):
-                        new_prods.append(prod)
-                
-                if new_prods:
-                    new_productions[nt] = new_prods
+        new_rules = {}
+        for nt, rhss in self.rules.items():
+            if names[nt] not in new_non_terminals:
+                continue
+            
+            # Check if all symbols in the production are accessible
+            new_rhss = [rhs for rhs in rhss if all(symbol in accessible for symbol in rhs)]
+            if new_rhss:
+                new_rules[nt] = new_rhss
         
         # Create a new grammar without inaccessible symbols
-        return Grammar(
-            non_terminals=new_non_terminals,
-            terminals=new_terminals,
-            productions=new_productions,
-            start_symbol=self.start_symbol
-        )
+        return Grammar._from_rules(self.symbols, new_non_terminals, new_terminals, new_rules, self.start_symbol)
     
+    @_cached_pass
     def eliminate_non_productive_symbols(self):
         """
         Eliminate non-productive symbols from the grammar.
@@ -320,63 +1006,58 @@ class Grammar:
         Returns:
             Grammar: A new Grammar object without non-productive symbols
         """
-        # Find all productive symbols
-        productive = set()
-        
-        # Initially, add all terminals as productive
-        for nt, prods in self.productions.items():
-            for prod in prods:
-                if all(symbol in self.terminals or symbol == 'ε' for symbol in prod):
-                    productive.add(nt)
-                    break
+        names = self.symbols.names
+        terminal_ids = self._terminal_ids()
         
-        # Iteratively find all productive symbols
-        changed = True
-        while changed:
-            changed = False
-            for nt, prods in self.productions.items():
-                if nt in productive:
-                    continue
-                
-                for prod in prods:
-                    if all(symbol in productive or symbol in self.terminals or symbol == 'ε' for symbol in prod):
-                        productive.add(nt)
-                        changed = True
-                        break
+        # Find all productive symbols
+        productive = self._productive_symbols()
         
         # Create new sets of non-terminals
-        new_non_terminals = self.non_terminals.intersection(productive)
+        productive_names = {names[symbol] for symbol in productive}
+        if productive_names >= self.non_terminals:
+            return self
+        new_non_terminals = self.non_terminals.intersection(productive_names)
         
         # Create new productions without non-productive symbols
-        new_productions = {}
-        for nt in new_non_terminals:
-            if nt in self.productions:
-                new_prods = []
-                for prod in self.productions[nt]:
-                    # Check if all non-terminals in the production are productive
-                    if all(symbol in productive or symbol in self.terminals or symbol == 'ε' for symbol in prod):
-                        new_prods.append(prod)
-                
-                if new_prods:
-                    new_productions[nt] = new_prods
+        new_rules = {}
+        for nt, rhss in self.rules.items():
+            if names[nt] not in new_non_terminals:
+                continue
+            
+            # Check if all non-terminals in the production are productive
+            new_rhss = [
+                rhs for rhs in rhss
+                if all(symbol in productive or symbol in terminal_ids for symbol in rhs)
+            ]
+            if new_rhss:
+                new_rules[nt] = new_rhss
         
         # Create a new grammar without non-productive symbols
-        return Grammar(
-            non_terminals=new_non_terminals,
-            terminals=self.terminals.copy(),
-            productions=new_productions,
-            start_symbol=self.start_symbol if self.start_symbol in productive else None
+        return Grammar._from_rules(
+            self.symbols,
+            new_non_terminals,
+            self.terminals,
+            new_rules,
+            self.start_symbol if self.start_symbol in productive_names else None
         )
     
-    def convert_to_cnf(self):
+    @_cached_pass
+    def convert_to_cnf(self, binarize=False):
         """
         Convert the grammar to Chomsky Normal Form.
         
+        Args:
+            binarize (bool): Binarize long productions before eliminating ε,
+                see eliminate_epsilon_productions()
+        
         Returns:
             Grammar: A new Grammar object in Chomsky Normal Form
         """
+        if self._is_cnf() and self._is_reduced():
+            return self
+        
         # Step 1: Eliminate ε-productions
-        grammar = self.eliminate_epsilon_productions()
+        grammar = self.eliminate_epsilon_productions(binarize)
         
         # Step 2: Eliminate renaming (unit productions)
         grammar = grammar.eliminate_renaming()
@@ -388,74 +1069,325 @@ class Grammar:
         grammar = grammar.eliminate_non_productive_symbols()
         
         # Step 5: Convert to CNF
-        new_non_terminals = grammar.non_terminals.copy()
-        new_productions = {}
-        terminal_map = {}  # Maps terminals to new non-terminals
+        new_non_terminals = set(grammar.non_terminals)
+        symbols = grammar.symbols.copy()
+        new_rules = {}
+        terminal_ids = grammar._terminal_ids()
+        start_id = grammar.symbols.ids.get(grammar.start_symbol)
+        
+        # Reuse existing non-terminals whose only production is a single
+        # terminal, so T_a is only minted for terminals without one
+        terminal_map = {}  # Maps terminal ids to non-terminal ids
+        pair_map = {}  # Maps (B, C) pairs to the X_n with X_n -> BC
+        for nt, rhss in grammar.rules.items():
+            if nt != start_id and len(rhss) == 1 and len(rhss[0]) == 1 and rhss[0][0] in terminal_ids:
+                terminal_map.setdefault(rhss[0][0], nt)
         
-        # Initialize productions
-        for nt in grammar.non_terminals:
-            new_productions[nt] = []
+        # Initialize productions; dict keys drop duplicate rules
+        for nt in grammar._non_terminal_ids():
+            new_rules[nt] = {}
         
         # Process each production
-        for nt, prods in grammar.productions.items():
-            for prod in prods:
-                if len(prod) == 1 and prod in grammar.terminals:
+        for nt, rhss in grammar.rules.items():
+            for rhs in rhss:
+                if not rhs and nt == start_id:
+                    # Rule S0 -> ε (kept so the start symbol still derives ε)
+                    new_rules[nt][rhs] = None
+                elif len(rhs) == 1 and rhs[0] in terminal_ids:
                     # Rule A -> a (already in CNF)
-                    new_productions[nt].append(prod)
-                elif len(prod) >= 2:
+                    new_rules[nt][rhs] = None
+                elif len(rhs) >= 2:
                     # Convert to CNF
-                    new_prod = self._convert_production_to_cnf(prod, grammar.terminals, new_non_terminals, new_productions, terminal_map)
-                    new_productions[nt].append(new_prod)
+                    new_rhs = self._convert_production_to_cnf(
+                        rhs, terminal_ids, new_non_terminals, new_rules, terminal_map, pair_map, symbols
+                    )
+                    new_rules[nt][new_rhs] = None
         
         # Create a new grammar in CNF
-        return Grammar(
-            non_terminals=new_non_terminals,
-            terminals=grammar.terminals.copy(),
-            productions=new_productions,
-            start_symbol=grammar.start_symbol
+        return Grammar._from_rules(
+            symbols,
+            new_non_terminals,
+            grammar.terminals,
+            {nt: list(rhss) for nt, rhss in new_rules.items()},
+            grammar.start_symbol
         )
     
-    def _convert_production_to_cnf(self, prod, terminals, non_terminals, productions, terminal_map):
+    def _is_reduced(self):
+        """
+        Check that every symbol is reachable and every non-terminal is productive.
+        """
+        ids = self.symbols.ids
+        reachable = self._reachable_symbols()
+        productive = self._productive_symbols()
+        return (
+            all(ids[nt] in reachable and ids[nt] in productive for nt in self.non_terminals)
+            and all(ids[t] in reachable for t in self.terminals)
+        )
+    
+    def _is_cnf(self):
+        """
+        Check that every production is A -> a, A -> BC, or S -> ε with S on no right-hand side.
+        """
+        terminal_ids = self._terminal_ids()
+        non_terminal_ids = set(self._non_terminal_ids())
+        for nt, rhss in self.rules.items():
+            for rhs in rhss:
+                if len(rhs) == 1 and rhs[0] in terminal_ids:
+                    continue
+                if len(rhs) == 2 and rhs[0] in non_terminal_ids and rhs[1] in non_terminal_ids:
+                    continue
+                if not rhs:
+                    continue
+                return False
+        return self._is_epsilon_free()
+    
+    def _convert_production_to_cnf(self, prod, terminals, non_terminals, rules, terminal_map, pair_map, symbols):
         """
         Convert a production to CNF format.
         
+        Pairs are hash-consed through pair_map: binarization runs from the
+        right, so productions sharing a suffix share its whole X_n chain.
+        
         Args:
-            prod (str): The production to convert
-            terminals (set): Set of terminal symbols
-            non_terminals (set): Set of non-terminal symbols
-            productions (dict): Dictionary of productions
-            terminal_map (dict): Maps terminals to new non-terminals
+            prod (tuple): The production to convert
+            terminals (set): Set of terminal symbol ids
+            non_terminals (set): Set of non-terminal symbols, new ones included
+            rules (dict): Maps non-terminal ids to dicts of their CNF productions
+            terminal_map (dict): Maps terminal ids to new non-terminal ids
+            pair_map (dict): Maps (B, C) pairs to the non-terminal id of X -> BC
+            symbols (SymbolTable): The symbol table of the new grammar
             
         Returns:
-            str: The converted production in CNF format
+            tuple: The converted production in CNF format
         """
         # Replace terminals with new non-terminals
-        symbols = []
+        converted = []
         for symbol in prod:
             if symbol in terminals:
                 if symbol not in terminal_map:
-                    new_nt = f"T_{symbol}"
-                    terminal_map[symbol] = new_nt
-                    non_terminals.add(new_nt)
-                    productions[new_nt] = [symbol]
-                symbols.append(terminal_map[symbol])
+                    new_nt = f"T_{symbols.names[symbol]}"
+                    if new_nt in non_terminals or new_nt in self.terminals:
+                        new_id, _ = _fresh_symbol(symbols, non_terminals, self.terminals, new_nt, 1)
+                    else:
+                        new_id = symbols.intern(new_nt)
+                        non_terminals.add(new_nt)
+                    terminal_map[symbol] = new_id
+                    rules[new_id] = {(symbol,): None}
+                converted.append(terminal_map[symbol])
             else:
-                symbols.append(symbol)
+                converted.append(symbol)
         
-        # If the production has only two symbols, it's already in CNF
-        if len(symbols) == 2:
-            return ''.join(symbols)
+        # Replace the last two symbols with one non-terminal until two are left
+        while len(converted) > 2:
+            pair = (converted[-2], converted[-1])
+            if pair not in pair_map:
+                new_id, _ = _fresh_symbol(symbols, non_terminals, self.terminals, 'X', len(pair_map) + 1)
+                pair_map[pair] = new_id
+                rules[new_id] = {pair: None}
+            converted[-2:] = [pair_map[pair]]
         
-        # Otherwise, create new non-terminals for groups of symbols
-        while len(symbols) > 2:
-            new_nt = f"X_{len(non_terminals)}"
-            non_terminals.add(new_nt)
-            
-            # Create a new production for the last two symbols
-            last_two = ''.join(symbols[-2:])
-            productions[new_nt] = [last_two]
-            
-            # Replace the last two symbols with the new non-terminal
-            symbols = symbols[:-2] + [new_nt]
+        return tuple(converted)
+
+
+def _fresh_symbol(symbols, non_terminals, terminals, prefix, counter):
+    """
+    Add the first non-terminal named prefix_i (i >= counter) that the grammar does not use yet.
+    
+    Names are checked against the symbols of the grammar being built, not
+    against the symbol table, so the result of a pass does not depend on
+    which other grammars share the table.
+    
+    Args:
+        symbols (SymbolTable): The symbol table to intern into
+        non_terminals (set): Non-terminals of the grammar being built, extended with the new one
+        terminals (set): Terminals of the grammar being built
+        prefix (str): Prefix of the new name
+        counter (int): First index to try
         
-        return ''.join(symbols)
+    Returns:
+        tuple: (id of the new symbol, next index to try)
+    """
+    while f"{prefix}_{counter}" in non_terminals or f"{prefix}_{counter}" in terminals:
+        counter += 1
+    non_terminals.add(f"{prefix}_{counter}")
+    return symbols.intern(f"{prefix}_{counter}"), counter + 1
+
+
+def _strongly_connected_components(nodes, edges):
+    """
+    Find the strongly connected components of a graph with Tarjan's algorithm.
+    
+    The search is iterative, so long chains do not hit the recursion limit.
+    Components are produced in reverse topological order: every component
+    comes after all the components reachable from it.
+    
+    Args:
+        nodes (list): The nodes of the graph
+        edges (dict): Dictionary mapping each node to its successors
+        
+    Yields:
+        list: The nodes of each component
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    
+    for root in nodes:
+        if root in index:
+            continue
+        
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(edges[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] != index[node]:
+                    continue
+                
+                # node is the root of a component
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                yield component
+
+
+def _derivable(rules, base):
+    """
+    Find the non-terminals with a production made only of base symbols and derivable non-terminals.
+    
+    This is the linear-time worklist algorithm behind the nullable (empty base)
+    and productive (terminals as base) analyses: every production keeps a
+    counter of its symbols that are not yet known to be derivable, and a
+    reverse index from each symbol to the productions using it decrements
+    those counters as symbols are found. Each occurrence is visited once, so
+    the whole analysis runs in O(|G|).
+    
+    Args:
+        rules (dict): Dictionary mapping non-terminal ids to tuples of symbol ids
+        base (set): Symbol ids that count as derivable from the start
+        
+    Returns:
+        set: Ids of the derivable non-terminals
+    """
+    rule_lhs = []
+    remaining = []
+    uses = {}  # Symbol id -> indexes of the productions it occurs in
+    found = set()
+    queue = []
+    
+    for lhs, rhss in rules.items():
+        for rhs in rhss:
+            missing = 0
+            for symbol in rhs:
+                if symbol not in base:
+                    missing += 1
+                    uses.setdefault(symbol, []).append(len(rule_lhs))
+            rule_lhs.append(lhs)
+            remaining.append(missing)
+            if missing == 0 and lhs not in found:
+                found.add(lhs)
+                queue.append(lhs)
+    
+    while queue:
+        symbol = queue.pop()
+        for rule in uses.get(symbol, ()):
+            remaining[rule] -= 1
+            if remaining[rule] == 0:
+                lhs = rule_lhs[rule]
+                if lhs not in found:
+                    found.add(lhs)
+                    queue.append(lhs)
+    
+    return found
+
+
+def _split_production(prod, known, longest):
+    """
+    Split a production string into grammar symbols.
+    
+    Symbols are matched longest first against the known symbol names, so
+    multi-character names such as 'T_a' or 'X_3' stay whole; any other
+    character is a symbol of its own.
+    
+    Args:
+        prod (str): The production to split
+        known (set): Known symbol names
+        longest (int): Length of the longest known name
+        
+    Returns:
+        list: The symbols of the production ([] for 'ε')
+    """
+    if prod == 'ε':
+        return []
+    
+    symbols = []
+    pos = 0
+    while pos < len(prod):
+        for size in range(min(longest, len(prod) - pos), 0, -1):
+            if size == 1 or prod[pos:pos + size] in known:
+                symbols.append(prod[pos:pos + size])
+                pos += size
+                break
+    return symbols
+
+
+# Grammar installed in each pool worker by _init_generate_worker()
+_worker_grammar = None
+
+
+def _init_generate_worker(grammar):
+    global _worker_grammar
+    _worker_grammar = grammar
+
+
+def _generate_chunk_task(task):
+    return _generate_chunk(_worker_grammar, *task)
+
+
+def _generate_chunk(grammar, seed, first_index, count, max_length, max_attempts=1000):
+    """Generate one chunk of words from its own seeded random stream."""
+    rng = random.Random()
+    words = []
+    while len(words) < count:
+        # Every word has its own stream, seeded with (seed, word index)
+        rng.seed(f"{seed}:{first_index + len(words)}")
+        for _ in range(max_attempts):
+            word = grammar.derive_word(rng, max_length=max_length)
+            if word is not None:
+                break
+        else:
+            raise ValueError(f"No word of at most {max_length} symbols after {max_attempts} attempts")
+        words.append(word)
+    return words
+
+
+def _generate_chunks(grammar, tasks, workers):
+    """Yield the words of every chunk in order, in-process or from a process pool."""
+    if workers == 1:
+        for task in tasks:
+            yield from _generate_chunk(grammar, *task)
+        return
+    
+    with Pool(workers, initializer=_init_generate_worker, initargs=(grammar,)) as pool:
+        for words in pool.imap(_generate_chunk_task, tasks):
+            yield from words
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import itertools
+
+from grammar import Grammar, pass_cache
+from cyk import CYKParser
+
+
+def nullable_grammars():
+    """
+    Grammars with long productions over many nullable symbols.
+    """
+    return [
+        Grammar.from_variant_25(),
+        Grammar(
+            non_terminals={'S', 'A', 'B', 'C', 'D'},
+            terminals={'a', 'b'},
+            productions={
+                'S': ['ABCDa', 'DCBA', 'aSb'],
+                'A': ['a', 'ε'],
+                'B': ['b', 'ε'],
+                'C': ['AB', 'ε'],
+                'D': ['aD', 'ε'],
+            },
+            start_symbol='S'
+        ),
+        Grammar(
+            non_terminals={'S', 'A'},
+            terminals={'a', 'b'},
+            productions={'S': ['AAAAAA', 'bSb'], 'A': ['a', 'ε']},
+            start_symbol='S'
+        ),
+    ]
+
+
+def test_binarize_before_epsilon_keeps_language():
+    """
+    Test that binarizing before ε-elimination (BIN before DEL) yields the same language.
+    """
+    for grammar in nullable_grammars():
+        plain = CYKParser(grammar.convert_to_cnf())
+        binarized = CYKParser(grammar.convert_to_cnf(binarize=True))
+        for length in range(0, 8):
+            for word in itertools.product(sorted(grammar.terminals), repeat=length):
+                word = ''.join(word)
+                assert plain.recognize(word) == binarized.recognize(word), word
+
+
+def test_shared_suffixes_and_no_duplicate_rules():
+    """
+    Test that binarization reuses one X_n per suffix and that CNF rules are deduplicated.
+    """
+    grammar = Grammar(
+        non_terminals={'S', 'A', 'B'},
+        terminals={'a', 'b', 'c'},
+        productions={
+            'S': ['BcAA', 'cBcAA', 'ABcAA', 'B'],
+            'A': ['a'],
+            'B': ['b', 'AA'],
+        },
+        start_symbol='S'
+    )
+    for binarize in (False, True):
+        cnf_grammar = grammar.convert_to_cnf(binarize=binarize)
+        for rhss in cnf_grammar.rules.values():
+            assert len(rhss) == len(set(rhss))
+        
+        # A -> a stands in for T_a, and the suffixes BcAA, cAA and AA get one
+        # X_n each (eight without sharing)
+        assert 'T_a' not in cnf_grammar.non_terminals
+        helpers = [nt for nt in cnf_grammar.non_terminals if nt.startswith('X_')]
+        assert len(helpers) == 3, sorted(helpers)
+    
+    binarized = grammar._binarize()
+    assert len([nt for nt in binarized.non_terminals if nt.startswith('X_')]) == 3
+
+
+
+def test_fresh_names_ignore_other_passes():
+    """
+    Test that X_n names depend only on the grammar, not on earlier passes sharing its symbols.
+    """
+    pass_cache.clear_cache()
+    fresh = Grammar.from_variant_25().convert_to_cnf()
+    
+    # Clear the cache so the conversion really runs on the shared table
+    grammar = Grammar.from_variant_25()
+    grammar.eliminate_epsilon_productions(binarize=True)
+    pass_cache.clear_cache()
+    converted = grammar.convert_to_cnf()
+    
+    assert converted == fresh
+    assert sorted(nt for nt in converted.non_terminals if nt.startswith('X_')) == [f"X_{i}" for i in range(1, 8)]
+
+
+if __name__ == "__main__":
+    test_binarize_before_epsilon_keeps_language()
+    test_shared_suffixes_and_no_duplicate_rules()
+    test_fresh_names_ignore_other_passes()
+    print("CNF tests passed!")
@@ -34,5 +34,23 @@ def test_custom_grammar():
     
     print("Conversion to Chomsky Normal Form completed successfully!")
 
+def test_multi_character_symbols():
+    """
+    Test that the symbols introduced by CNF conversion survive another conversion.
+    """
+    cnf_grammar = Grammar.from_variant_25().convert_to_cnf()
+    assert 'T_a' in cnf_grammar.non_terminals
+    
+    # Reconverting splits nothing: every X_n and T_x stays one symbol
+    reconverted = cnf_grammar.convert_to_cnf()
+    assert reconverted.non_terminals <= cnf_grammar.non_terminals | {'S0'}
+    
+    # Round trip through the string form keeps the multi-character symbols whole
+    copy = Grammar(cnf_grammar.non_terminals, cnf_grammar.terminals, cnf_grammar.productions, cnf_grammar.start_symbol)
+    assert copy.productions == cnf_grammar.productions
+    for rhss in copy.rules.values():
+        assert all(len(rhs) <= 2 for rhs in rhss)
+
 if __name__ == "__main__":
     test_custom_grammar()
+    test_multi_character_symbols()
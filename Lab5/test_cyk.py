@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import itertools
+import random
+
+from grammar import Grammar
+from cyk import CYKParser
+
+
+def tree_yield(tree):
+    """
+    Collect the terminals at the leaves of a CYK derivation tree.
+    """
+    symbol, children = tree
+    if children and isinstance(children[0], str):
+        return children[0]
+    return ''.join(tree_yield(child) for child in children)
+
+
+def test_cyk_balanced_parentheses():
+    """
+    Test CYK recognition on a CNF grammar of non-empty balanced parentheses.
+    """
+    grammar = Grammar(
+        non_terminals={'S', 'L', 'R', 'X'},
+        terminals={'(', ')'},
+        productions={
+            'S': ['SS', 'LR', 'LX'],
+            'X': ['SR'],
+            'L': ['('],
+            'R': [')'],
+        },
+        start_symbol='S'
+    )
+    parser = CYKParser(grammar)
+
+    for length in range(1, 9):
+        for word in itertools.product('()', repeat=length):
+            word = ''.join(word)
+            depth = 0
+            balanced = True
+            for char in word:
+                depth += 1 if char == '(' else -1
+                balanced = balanced and depth >= 0
+            assert parser.recognize(word) == (balanced and depth == 0), word
+
+
+def test_cyk_on_converted_grammar():
+    """
+    Test that words derived from the Variant 25 grammar are recognized after CNF conversion.
+    """
+    grammar = Grammar.from_variant_25()
+    parser = CYKParser(grammar.convert_to_cnf())
+
+    rng = random.Random(25)
+    for _ in range(200):
+        word = grammar.derive_word(rng, max_length=30)
+        if not word:
+            continue
+        assert parser.recognize(word), word
+        assert tree_yield(parser.parse(word)) == word
+
+    assert not parser.recognize('bb')
+    assert parser.parse('bb') is None
+
+
+if __name__ == "__main__":
+    test_cyk_balanced_parentheses()
+    test_cyk_on_converted_grammar()
+    print("CYK tests passed!")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import itertools
+import time
+
+from grammar import Grammar
+from cyk import CYKParser
+from earley import EarleyParser
+
+
+def test_earley_matches_cyk():
+    """
+    Test that Earley on the original grammar agrees with CYK on its CNF conversion.
+    """
+    grammars = [
+        Grammar.from_variant_25(),
+        Grammar(
+            non_terminals={'S', 'A', 'B'},
+            terminals={'a', 'b', 'c'},
+            productions={
+                'S': ['AB', 'aB'],
+                'A': ['a', 'aS', 'ε'],
+                'B': ['b', 'bS', 'c']
+            },
+            start_symbol='S'
+        ),
+        Grammar(
+            non_terminals={'S'},
+            terminals={'a', 'b'},
+            productions={'S': ['aSb', 'ε']},
+            start_symbol='S'
+        ),
+    ]
+
+    for grammar in grammars:
+        earley = EarleyParser(grammar)
+        cyk = CYKParser(grammar.convert_to_cnf())
+        for length in range(0, 8):
+            for word in itertools.product(sorted(grammar.terminals), repeat=length):
+                word = ''.join(word)
+                assert earley.recognize(word) == cyk.recognize(word), word
+
+
+def test_earley_nullable_and_right_recursion():
+    """
+    Test ε-productions and a long right-recursive input.
+    """
+    balanced = EarleyParser(Grammar(
+        non_terminals={'S'},
+        terminals={'a', 'b'},
+        productions={'S': ['aSb', 'SS', 'ε']},
+        start_symbol='S'
+    ))
+    assert balanced.recognize('')
+    assert balanced.recognize('aabbab')
+    assert not balanced.recognize('abba')
+
+    sums = EarleyParser(Grammar(
+        non_terminals={'E'},
+        terminals={'a', '+'},
+        productions={'E': ['a+E', 'a']},
+        start_symbol='E'
+    ))
+    assert sums.recognize('a+' * 2000 + 'a')
+    assert not sums.recognize('a+' * 2000)
+
+    # Right recursion followed by a symbol that derives only ε stays linear:
+    # twice the input should take about twice as long, not four times
+    trailing = EarleyParser(Grammar(
+        non_terminals={'S', 'A'},
+        terminals={'a'},
+        productions={'S': ['aSA', 'a'], 'A': ['ε']},
+        start_symbol='S'
+    ))
+    timings = []
+    for length in (2000, 4000):
+        start = time.perf_counter()
+        assert trailing.recognize('a' * length)
+        timings.append(time.perf_counter() - start)
+    assert timings[1] < 3 * timings[0] + 0.05, timings
+
+    # A nullable symbol that can also match input must not be skipped
+    optional = EarleyParser(Grammar(
+        non_terminals={'S', 'A'},
+        terminals={'a', 'b'},
+        productions={'S': ['aSA', 'a'], 'A': ['b', 'ε']},
+        start_symbol='S'
+    ))
+    assert optional.recognize('aaab')
+    assert optional.recognize('aaabb')
+    assert not optional.recognize('aaabbb')
+
+
+def test_earley_rejects_non_terminal_tokens():
+    """
+    Test that tokens named like non-terminals are not scanned.
+    """
+    parser = EarleyParser(Grammar(
+        non_terminals={'S', 'A'},
+        terminals={'a', 'b'},
+        productions={'S': ['aA'], 'A': ['b']},
+        start_symbol='S'
+    ))
+    assert parser.recognize('ab')
+    assert not parser.recognize('aA')
+    assert not parser.recognize('S')
+
+
+if __name__ == "__main__":
+    test_earley_matches_cyk()
+    test_earley_nullable_and_right_recursion()
+    test_earley_rejects_non_terminal_tokens()
+    print("Earley tests passed!")
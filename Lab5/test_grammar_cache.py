@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+from grammar import Grammar, pass_cache
+
+
+def test_normalized_grammars_are_reused():
+    """
+    Test that passes return normalized grammars unchanged and serve repeated work from the cache.
+    """
+    cnf_grammar = Grammar.from_variant_25().convert_to_cnf()
+    assert cnf_grammar.convert_to_cnf() is cnf_grammar
+    assert cnf_grammar.eliminate_renaming() is cnf_grammar
+    
+    # A grammar built separately from the same productions hits the cache
+    hits = pass_cache.cache_info()["hits"]
+    assert Grammar.from_variant_25() == Grammar.from_variant_25()
+    assert Grammar.from_variant_25().convert_to_cnf() is cnf_grammar
+    assert pass_cache.cache_info()["hits"] > hits
+
+
+def test_cnf_shortcut_still_reduces():
+    """
+    Test that a grammar already shaped like CNF still loses its useless symbols.
+    """
+    grammar = Grammar(
+        non_terminals={'S', 'A', 'B', 'C', 'D'},
+        terminals={'a', 'b'},
+        productions={'S': ['AB'], 'A': ['a'], 'B': ['b'], 'C': ['a'], 'D': ['DD']},
+        start_symbol='S'
+    )
+    cnf_grammar = grammar.convert_to_cnf()
+    assert cnf_grammar.non_terminals == {'S', 'A', 'B'}
+    assert cnf_grammar.convert_to_cnf() is cnf_grammar
+    
+    # Without a start symbol nothing is reachable, and None is never interned
+    empty = Grammar(
+        non_terminals={'S', 'A'},
+        terminals={'a'},
+        productions={'S': ['SA'], 'A': ['a']},
+        start_symbol='S'
+    ).eliminate_non_productive_symbols()
+    assert empty.start_symbol is None
+    assert empty._reachable_symbols() == frozenset()
+    assert None not in empty.symbols.names
+
+
+def test_single_rule_edits():
+    """
+    Test that analyses carried over by single-rule edits match a full recomputation.
+    """
+    grammar = Grammar(
+        non_terminals={'S', 'A', 'B', 'C'},
+        terminals={'a', 'b'},
+        productions={'S': ['AB'], 'A': ['a', 'ε'], 'B': ['bB'], 'C': ['a']},
+        start_symbol='S'
+    )
+    edits = [
+        ('with', 'B', 'ε'),
+        ('with', 'S', 'C'),
+        ('without', 'A', 'ε'),
+        ('without', 'B', 'bB'),
+        ('with', 'C', 'SC'),
+    ]
+    for kind, nt, prod in edits:
+        grammar._nullable_symbols()
+        grammar._productive_symbols()
+        grammar._reachable_symbols()
+        if kind == 'with':
+            grammar = grammar.with_production(nt, prod)
+        else:
+            grammar = grammar.without_production(nt, prod)
+        
+        rebuilt = Grammar(grammar.non_terminals, grammar.terminals, grammar.productions, grammar.start_symbol)
+        assert rebuilt == grammar
+        for analysis in ('_nullable_symbols', '_productive_symbols', '_reachable_symbols'):
+            edited = {grammar.symbols.names[i] for i in getattr(grammar, analysis)()}
+            fresh = {rebuilt.symbols.names[i] for i in getattr(rebuilt, analysis)()}
+            assert edited == fresh, (analysis, kind, nt, prod)
+
+
+
+def test_passes_do_not_grow_symbol_tables():
+    """
+    Test that passes intern new symbols into their own table and re-normalizing stays bounded.
+    """
+    grammar = Grammar.from_variant_25()
+    size = len(grammar.symbols)
+    sizes = set()
+    for _ in range(5):
+        pass_cache.clear_cache()
+        cnf_grammar = grammar.convert_to_cnf()
+        grammar.eliminate_epsilon_productions(binarize=True)
+        cnf_grammar.derive_word()
+        cnf_grammar._reachable_symbols()
+        
+        # Editing and converting again reuses the names the edit dropped
+        edited = cnf_grammar.with_production('S0', 'aaaa').convert_to_cnf()
+        sizes.add((len(cnf_grammar.symbols), len(edited.symbols)))
+        assert len(grammar.symbols) == size
+    assert len(sizes) == 1
+
+
+if __name__ == "__main__":
+    test_normalized_grammars_are_reused()
+    test_cnf_shortcut_still_reduces()
+    test_single_rule_edits()
+    test_passes_do_not_grow_symbol_tables()
+    print("Grammar cache tests passed!")
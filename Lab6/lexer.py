@@ -1,9 +1,16 @@
-from token_types import TokenType, COMPILED_REGEX
+from array import array
+
+from token_types import TokenType, COMPILED_REGEX, COMPILED_BYTES_REGEX
+
+# Token types by their enum value, for the compact token arrays
+TYPES_BY_ID = {token_type.value: token_type for token_type in TokenType}
 
 class Token:
     """
     Represents a token identified by the lexer.
     """
+    __slots__ = ("type", "value", "position")
+    
     def __init__(self, token_type, value, position):
         self.type = token_type
         self.value = value
@@ -13,6 +20,54 @@ class Token:
         return f"Token({self.type}, '{self.value}', pos={self.position})"
 
 
+class CompactTokens:
+    """
+    Tokens stored column-wise as arrays of type ids and start/end offsets into the input.
+    Token text is sliced on demand; for bytes input it is a zero-copy memoryview.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.view = None if isinstance(text, str) else memoryview(text)
+        self.types = array('B')   # TokenType values
+        self.starts = array('q')
+        self.ends = array('q')
+    
+    def append(self, type_id, start, end):
+        self.types.append(type_id)
+        self.starts.append(start)
+        self.ends.append(end)
+    
+    def __len__(self):
+        return len(self.types)
+    
+    def type(self, index):
+        """
+        Return the TokenType of a token.
+        """
+        return TYPES_BY_ID[self.types[index]]
+    
+    def value(self, index):
+        """
+        Return the text of a token, as a str slice or a memoryview for bytes input.
+        """
+        source = self.text if self.view is None else self.view
+        return source[self.starts[index]:self.ends[index]]
+    
+    def __getitem__(self, index):
+        """
+        Build the Token object of a single entry.
+        """
+        value = self.value(index)
+        if self.view is not None:
+            value = bytes(value).decode('ascii')
+        return Token(TYPES_BY_ID[self.types[index]], value, self.starts[index])
+    
+    def __iter__(self):
+        # Token objects are created one at a time, so a Parser holds only one
+        for index in range(len(self.types)):
+            yield self[index]
+
+
 class Lexer:
     """
     Lexical analyzer that converts input text into a stream of tokens.
@@ -46,10 +101,91 @@ class Lexer:
         
         return self.tokens
     
+    def iter_tokens(self, chunk_size=65536):
+        """
+        Lazily yield the non-whitespace tokens, ending with EOF.
+        The text may be a string, a file-like object with read(), or an iterable of string chunks.
+        """
+        if isinstance(self.text, str):
+            chunks = [self.text]
+        elif hasattr(self.text, "read"):
+            chunks = iter(lambda: self.text.read(chunk_size), "")
+        else:
+            chunks = self.text
+        
+        buffer = ""
+        offset = 0  # Position of the buffer start in the whole input
+        for chunk in chunks:
+            buffer += chunk
+            
+            # The last match could still grow (or turn from INTEGER into FLOAT)
+            # with the next chunk, so it is scanned again together with it
+            last = None
+            for match in COMPILED_REGEX.finditer(buffer):
+                if last is not None:
+                    yield from self._match_token(last, offset)
+                last = match
+            
+            # Characters after the last match are skipped, as in tokenize().
+            # Whitespace never merges with a later token, so a trailing
+            # whitespace match is dropped rather than carried over
+            if last is None:
+                keep = len(buffer)
+            elif last.lastgroup == "WHITESPACE":
+                keep = last.end()
+            else:
+                keep = last.start()
+            buffer = buffer[keep:]
+            offset += keep
+        
+        for match in COMPILED_REGEX.finditer(buffer):
+            yield from self._match_token(match, offset)
+        
+        yield Token(TokenType.EOF, "", offset + len(buffer))
+    
+    def _match_token(self, match, offset):
+        """
+        Yield the token of a regex match, unless it is whitespace.
+        """
+        token_type_name = match.lastgroup
+        if token_type_name != "WHITESPACE":
+            yield Token(TokenType[token_type_name], match.group(), offset + match.start())
+    
+    def tokenize_compact(self, skip_whitespace=True):
+        """
+        Tokenize the whole text (str or bytes) into CompactTokens, ending with EOF.
+        No Token objects are created.
+        """
+        text = self.text
+        regex = COMPILED_REGEX if isinstance(text, str) else COMPILED_BYTES_REGEX
+        
+        # Map regex group numbers straight to type ids
+        group_types = [0] * (regex.groups + 1)
+        for name, group in regex.groupindex.items():
+            group_types[group] = TokenType[name].value
+        whitespace = TokenType.WHITESPACE.value
+        
+        tokens = CompactTokens(text)
+        types, starts, ends = tokens.types, tokens.starts, tokens.ends
+        for match in regex.finditer(text):
+            type_id = group_types[match.lastindex]
+            if skip_whitespace and type_id == whitespace:
+                continue
+            start, end = match.span()
+            types.append(type_id)
+            starts.append(start)
+            ends.append(end)
+        
+        tokens.append(TokenType.EOF.value, len(text), len(text))
+        return tokens
+    
     def get_tokens(self, skip_whitespace=True):
         """
         Return the list of tokens, optionally filtering out whitespace tokens.
         """
+        if not self.tokens and skip_whitespace:
+            # Skip the whitespace while scanning instead of filtering a full list
+            return list(self.iter_tokens())
         if not self.tokens:
             self.tokenize()
         
@@ -9,24 +9,26 @@ class Parser:
     """
     Parser that constructs an Abstract Syntax Tree (AST) from a stream of tokens.
     Uses recursive descent parsing with precedence climbing for expressions.
+    Tokens are pulled one at a time, so only the current token is kept in memory.
     """
     def __init__(self, text=None, tokens=None):
         if text is not None:
+            # text may also be a file-like object or an iterable of chunks
             self.lexer = Lexer(text)
-            self.tokens = self.lexer.get_tokens()
+            self.tokens = self.lexer.iter_tokens()
         elif tokens is not None:
-            self.tokens = tokens
+            self.tokens = iter(tokens)
         else:
             raise ValueError("Either text or tokens must be provided")
         
         self.current_token_index = 0
-        self.current_token = self.tokens[0] if self.tokens else None
+        self.current_token = next(self.tokens, None)
     
     def parse(self):
         """
         Parse the token stream and return the AST.
         """
-        if not self.tokens:
+        if self.current_token is None:
             return None
         
         # Start parsing from the highest level (program)
@@ -174,10 +176,7 @@ class Parser:
         Advance to the next token.
         """
         self.current_token_index += 1
-        if self.current_token_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_token_index]
-        else:
-            self.current_token = None
+        self.current_token = next(self.tokens, None)
 
 
 def parse_text(text):
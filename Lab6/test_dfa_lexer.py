@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import random
+import re
+
+from token_types import TokenType
+from lexer import Lexer
+from dfa_lexer import DFALexer
+
+# A keyword directly followed by identifier characters: the regex lexer splits
+# it (SIN + 'h'), the DFA lexer keeps the longest match ('sinh')
+KEYWORD_PREFIX = re.compile(r'(?<![A-Za-z0-9_])(sin|cos|tan|log)[A-Za-z0-9_]')
+
+
+def token_tuples(tokens):
+    """
+    Turn tokens into comparable (type, value, position) tuples.
+    """
+    return [(token.type, token.value, token.position) for token in tokens]
+
+
+def test_dfa_lexer_matches_regex_lexer():
+    """
+    Test that DFALexer gives the same tokens as Lexer on random inputs.
+    """
+    rng = random.Random(23)
+    alphabet = '0123456789.+-*/^(),abcsinoxtglzZ_ \t\n@'
+    checked = 0
+    while checked < 5000:
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(40)))
+        if KEYWORD_PREFIX.search(text):
+            continue
+        assert token_tuples(DFALexer(text).tokenize()) == token_tuples(Lexer(text).tokenize()), text
+        assert token_tuples(DFALexer(text).get_tokens()) == token_tuples(Lexer(text).get_tokens()), text
+        checked += 1
+
+
+def test_dfa_lexer_maximal_munch():
+    """
+    Test the cases where maximal munch differs from the regex alternation.
+    """
+    tokens = DFALexer('sinh(x) + logx - sin(y)').get_tokens()
+    assert [(token.type, token.value) for token in tokens] == [
+        (TokenType.IDENTIFIER, 'sinh'), (TokenType.LPAREN, '('), (TokenType.IDENTIFIER, 'x'),
+        (TokenType.RPAREN, ')'), (TokenType.PLUS, '+'), (TokenType.IDENTIFIER, 'logx'),
+        (TokenType.MINUS, '-'), (TokenType.SIN, 'sin'), (TokenType.LPAREN, '('),
+        (TokenType.IDENTIFIER, 'y'), (TokenType.RPAREN, ')'), (TokenType.EOF, ''),
+    ]
+    assert [token.value for token in Lexer('sinh').get_tokens()] == ['sin', 'h', '']
+
+
+def test_dfa_lexer_ascii_digits():
+    """
+    Test that \\d is ASCII-only in the DFA lexer, unlike Python's re.
+    """
+    text = '1٣ 2'  # ARABIC-INDIC DIGIT THREE after an ASCII digit
+    assert [token.value for token in Lexer(text).get_tokens()] == ['1٣', '2', '']
+    assert [token.value for token in DFALexer(text).get_tokens()] == ['1', '2', '']
+
+
+if __name__ == "__main__":
+    test_dfa_lexer_matches_regex_lexer()
+    test_dfa_lexer_maximal_munch()
+    test_dfa_lexer_ascii_digits()
+    print("DFA lexer tests passed!")
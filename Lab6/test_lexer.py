@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import io
+import random
+
+from lexer import Lexer
+from parser import Parser
+from ast_nodes import BinaryOpNode, FunctionCallNode
+
+
+def token_tuples(tokens):
+    """
+    Turn tokens into comparable (type, value, position) tuples.
+    """
+    return [(token.type, token.value, token.position) for token in tokens]
+
+
+def random_text(rng, length):
+    """
+    Random input mixing every token kind, whitespace and unmatched characters.
+    """
+    pieces = ['12', '3.14', '3.', '.5', '+', '-', '*', '/', '^', '(', ')', ',',
+              'sin', 'cos', 'tan', 'log', 'x_1', 'y', ' ', '   ', '\t', '\n', '@']
+    return ''.join(rng.choice(pieces) for _ in range(length))
+
+
+def test_iter_tokens_across_chunk_boundaries():
+    """
+    Test that chunked and file input yield the same tokens as the whole string.
+    """
+    rng = random.Random(24)
+    for _ in range(500):
+        text = random_text(rng, rng.randrange(40))
+        expected = token_tuples(Lexer(text).get_tokens())
+        
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, 5)))
+        chunks = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+        assert token_tuples(Lexer(chunks).iter_tokens()) == expected, chunks
+        
+        chunk_size = rng.randrange(1, 6)
+        assert token_tuples(Lexer(io.StringIO(text)).iter_tokens(chunk_size)) == expected, text
+    
+    # A number split right after its dot is still one FLOAT
+    assert token_tuples(Lexer(['3.', '14']).iter_tokens())[0][1] == '3.14'
+
+
+def test_long_whitespace_is_not_buffered():
+    """
+    Test that a whitespace run spanning many chunks is dropped chunk by chunk.
+    """
+    text = "1 +" + " " * 100000 + "2"
+    tokens = token_tuples(Lexer(io.StringIO(text)).iter_tokens(chunk_size=64))
+    assert [value for _, value, _ in tokens] == ['1', '+', '2', '']
+    assert tokens[2][2] == len(text) - 1
+
+
+def test_compact_tokens_and_streaming_parser():
+    """
+    Test the compact token store and the parser consuming streamed tokens.
+    """
+    text = "2 + 3.14 * sin(x_1, 0.5) ^ 2"
+    expected = token_tuples(Lexer(text).get_tokens())
+    assert token_tuples(Lexer(text).tokenize_compact()) == expected
+    assert token_tuples(Lexer(text.encode()).tokenize_compact()) == expected
+    
+    compact = Lexer(text.encode()).tokenize_compact()
+    assert bytes(compact.value(4)) == b'sin'
+    
+    for source in (text, io.StringIO(text), [text[:7], text[7:15], text[15:]]):
+        ast = Parser(text=source).parse()
+        assert isinstance(ast.expression, BinaryOpNode)
+        assert isinstance(ast.expression.right.right.left, FunctionCallNode)
+    ast = Parser(tokens=Lexer(text).tokenize_compact()).parse()
+    assert isinstance(ast.expression, BinaryOpNode)
+
+
+if __name__ == "__main__":
+    test_iter_tokens_across_chunk_boundaries()
+    test_long_whitespace_is_not_buffered()
+    test_compact_tokens_and_streaming_parser()
+    print("Lexer tests passed!")
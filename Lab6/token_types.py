@@ -56,3 +56,6 @@ TOKEN_PATTERNS = [
 # Compile all patterns into a single regex for efficient matching
 TOKEN_REGEX = '|'.join('(?P<%s>%s)' % (token_type.name, pattern) for token_type, pattern in TOKEN_PATTERNS)
 COMPILED_REGEX = re.compile(TOKEN_REGEX)
+
+# Same patterns for bytes input (the patterns are ASCII)
+COMPILED_BYTES_REGEX = re.compile(TOKEN_REGEX.encode('ascii'))